@@ -8,9 +8,11 @@ with support for YAML/JSON files, environment variables, and profiles.
 from .manager import ConfigManager
 from .parser import ConfigParser
 from .env import EnvironmentHandler
+from .overlay import OverlayConfig
 
 __all__ = [
     "ConfigManager",
     "ConfigParser", 
-    "EnvironmentHandler"
+    "EnvironmentHandler",
+    "OverlayConfig"
 ]
\ No newline at end of file
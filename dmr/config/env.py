@@ -5,8 +5,9 @@ Handles loading and processing environment variables with validation
 and type conversion.
 """
 
+import copy
 import os
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, FrozenSet, Optional, Tuple, Union
 
 
 class EnvironmentHandler:
@@ -15,6 +16,21 @@ class EnvironmentHandler:
     # Environment variable prefix for D-Model-Runner
     ENV_PREFIX = "DMR_"
     
+    # Map common environment variables to config structure
+    CONFIG_MAPPING = {
+        'base_url': 'api.base_url',
+        'api_key': 'api.key',
+        'default_model': 'api.models.default',
+        'max_tokens': 'api.models.max_tokens',
+        'temperature': 'api.models.temperature',
+        'debug': 'logging.debug',
+        'log_level': 'logging.level'
+    }
+    
+    # Memoized overrides keyed by the DMR_* subset of os.environ
+    _cached_overrides: Optional[Dict[str, Any]] = None
+    _cached_env_snapshot: Optional[FrozenSet[Tuple[str, str]]] = None
+    
     @classmethod
     def load_env_vars(cls) -> Dict[str, Any]:
         """
@@ -107,28 +123,38 @@ class EnvironmentHandler:
         """
         Get environment variables formatted as configuration overrides.
         
+        The result is memoized against a snapshot of the DMR_-prefixed
+        environment variables and rebuilt only when that snapshot changes.
+        
         Returns:
-            Dictionary suitable for merging with config files
+            Dictionary suitable for merging with config files; a fresh copy,
+            so callers may modify it without affecting the memoized result
         """
+        snapshot = cls._env_snapshot()
+        if cls._cached_overrides is not None and snapshot == cls._cached_env_snapshot:
+            return copy.deepcopy(cls._cached_overrides)
+        
         env_vars = cls.load_env_vars()
         config_overrides = {}
         
-        # Map common environment variables to config structure
-        mapping = {
-            'base_url': 'api.base_url',
-            'api_key': 'api.key',
-            'default_model': 'api.models.default',
-            'max_tokens': 'api.models.max_tokens',
-            'temperature': 'api.models.temperature',
-            'debug': 'logging.debug',
-            'log_level': 'logging.level'
-        }
-        
-        for env_key, config_path in mapping.items():
+        for env_key, config_path in cls.CONFIG_MAPPING.items():
             if env_key in env_vars:
                 cls._set_nested_value(config_overrides, config_path, env_vars[env_key])
         
-        return config_overrides
+        cls._cached_overrides = config_overrides
+        cls._cached_env_snapshot = snapshot
+        return copy.deepcopy(config_overrides)
+    
+    @classmethod
+    def _env_snapshot(cls) -> FrozenSet[Tuple[str, str]]:
+        """
+        Capture the DMR_-prefixed environment variables.
+        
+        Returns:
+            Frozen set of (key, value) pairs
+        """
+        prefix = cls.ENV_PREFIX
+        return frozenset(item for item in os.environ.items() if item[0].startswith(prefix))
     
     @classmethod
     def _set_nested_value(cls, data: Dict[str, Any], path: str, value: Any) -> None:
@@ -5,17 +5,38 @@ Central configuration orchestrator that handles loading, merging,
 and managing configuration from multiple sources with intelligent caching.
 """
 
+import copy
 import os
 import time
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
 
 from .parser import ConfigParser
 from .env import EnvironmentHandler
-from ..utils.helpers import merge_configs, safe_get_nested, validate_model_name
+from .overlay import OverlayConfig
+from ..utils.helpers import merge_configs, validate_model_name
 from ..utils.performance import measure_performance, track_cache_performance
 
 
+def _plain_copy(config: Mapping) -> Dict[str, Any]:
+    """
+    Copy a configuration view into an independent plain dictionary.
+    
+    Merged views share nested dictionaries with the cached layers, so the
+    copy is deep; callers may modify it without touching the caches.
+    
+    Args:
+        config: Configuration mapping or layered view
+        
+    Returns:
+        Deep copy as nested plain dictionaries
+    """
+    if isinstance(config, OverlayConfig):
+        config = config.to_dict()
+    return copy.deepcopy(dict(config))
+
+
 class ConfigManager:
     """Central configuration manager for D-Model-Runner with intelligent caching."""
     
@@ -27,7 +48,7 @@ class ConfigManager:
             config_dir: Directory containing configuration files
         """
         self.config_dir = Path(config_dir) if config_dir else Path.cwd() / "config"
-        self._config: Dict[str, Any] = {}
+        self._config: OverlayConfig = OverlayConfig([])
         self._profile: str = "default"
         self._loaded = False
         
@@ -48,7 +69,20 @@ class ConfigManager:
             reload: Force reload even if already loaded
             
         Returns:
-            Complete merged configuration dictionary
+            Complete merged configuration dictionary; a copy the caller may modify
+        """
+        return _plain_copy(self._load_overlay(profile, reload))
+    
+    def _load_overlay(self, profile: str = "default", reload: bool = False) -> OverlayConfig:
+        """
+        Load the configuration layers, reusing them while nothing has changed.
+        
+        Args:
+            profile: Configuration profile to load
+            reload: Force reload even if already loaded
+            
+        Returns:
+            Layered configuration view shared by lookups; not for callers to keep
         """
         # Check if we can use cached configuration
         if self._loaded and not reload and self._profile == profile and self._cache_valid:
@@ -59,17 +93,16 @@ class ConfigManager:
         self._profile = profile
         
         # Start with default configuration
-        config = self._load_default_config_cached()
+        default_config = self._load_default_config_cached()
         
         # Load profile-specific configuration
         profile_config = self._load_profile_config_cached(profile)
-        if profile_config:
-            config = merge_configs(config, profile_config)
         
         # Apply environment variable overrides
         env_overrides = self._get_env_overrides_cached()
-        if env_overrides:
-            config = merge_configs(config, env_overrides)
+        
+        # Layer the sources instead of deep-merging them; lookups resolve lazily
+        config = OverlayConfig([env_overrides, profile_config, default_config])
         
         # Validate the final configuration
         ConfigParser.validate_config_structure(config)
@@ -92,18 +125,18 @@ class ConfigManager:
             Configuration value or default
         """
         if not self._loaded:
-            self.load_config()
+            self._load_overlay()
         
-        return safe_get_nested(self._config, path, default)
+        return self._config.get_path(path, default)
     
     def get_api_config(self) -> Dict[str, Any]:
         """
         Get API-specific configuration.
         
         Returns:
-            API configuration dictionary
+            API configuration dictionary; a copy the caller may modify
         """
-        return self.get('api', {})
+        return _plain_copy(self.get('api', {}))
     
     def get_base_url(self) -> str:
         """
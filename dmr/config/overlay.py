@@ -0,0 +1,128 @@
+"""
+Layered configuration overlay for D-Model-Runner
+
+Provides a read-only, ChainMap-style view over several configuration
+layers so that profiles and environment overrides can be applied without
+deep-copying the whole configuration tree on every load.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+
+_MISSING = object()
+
+
+class OverlayConfig(Mapping):
+    """
+    Read-only view over configuration layers ordered from highest to lowest priority.
+
+    Lookups resolve with the same semantics as repeatedly applying
+    ``merge_configs``: nested dictionaries are merged key by key, while any
+    non-dictionary value replaces whatever the lower layers define.
+    """
+
+    def __init__(self, layers: List[Mapping]):
+        """
+        Initialize the overlay.
+
+        Args:
+            layers: Configuration dictionaries, highest priority first
+        """
+        # Empty or missing layers can never win a lookup, so drop them up front
+        self._layers = [layer for layer in layers if layer]
+        self._materialized: Optional[Dict[str, Any]] = None
+
+    @property
+    def layers(self) -> List[Mapping]:
+        """Configuration layers, highest priority first."""
+        return self._layers
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._resolve(self._layers, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for layer in self._layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers)
+
+    def __repr__(self) -> str:
+        return f"OverlayConfig({self.to_dict()!r})"
+
+    def get_path(self, path: str, default: Any = None) -> Any:
+        """
+        Get a value using dot notation, touching only the layers on the path.
+
+        Args:
+            path: Dot-separated configuration path (e.g., 'api.models.default')
+            default: Default value if path not found
+
+        Returns:
+            Configuration value or default
+        """
+        value: Any = self
+        for key in path.split('.'):
+            if isinstance(value, OverlayConfig):
+                value = self._resolve(value._layers, key)
+            elif isinstance(value, Mapping):
+                value = value.get(key, _MISSING)
+            else:
+                return default
+            if value is _MISSING:
+                return default
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Materialize the merged configuration as a plain dictionary.
+
+        The result is computed on first use and cached for subsequent calls.
+
+        Returns:
+            Merged configuration dictionary
+        """
+        if self._materialized is None:
+            merged: Dict[str, Any] = {}
+            for key in self:
+                value = self[key]
+                if isinstance(value, OverlayConfig):
+                    value = value.to_dict()
+                merged[key] = value
+            self._materialized = merged
+        return self._materialized
+
+    @staticmethod
+    def _resolve(layers: List[Mapping], key: str) -> Any:
+        """Resolve a single key across layers, merging nested dictionaries lazily."""
+        found: List[Mapping] = []
+        for layer in layers:
+            if not isinstance(layer, Mapping) or key not in layer:
+                continue
+            value = layer[key]
+            if not isinstance(value, Mapping):
+                # Scalars shadow everything below; a higher dict shadows lower scalars
+                return value if not found else OverlayConfig.from_layers(found)
+            found.append(value)
+
+        if not found:
+            return _MISSING
+        return OverlayConfig.from_layers(found)
+
+    @classmethod
+    def from_layers(cls, layers: List[Mapping]) -> Any:
+        """Return the single layer unchanged, or an overlay when several layers apply."""
+        if len(layers) == 1:
+            return layers[0]
+        return cls(layers)
@@ -7,6 +7,7 @@ with validation and error handling.
 
 import json
 import yaml
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 from ..utils.helpers import format_error_message
@@ -122,12 +123,12 @@ class ConfigParser:
             raise ValueError(format_error_message(e, f"saving config to {file_path}"))
     
     @classmethod
-    def validate_config_structure(cls, config: Dict[str, Any]) -> bool:
+    def validate_config_structure(cls, config: Mapping) -> bool:
         """
         Validate basic configuration structure.
         
         Args:
-            config: Configuration dictionary to validate
+            config: Configuration dictionary (or layered view) to validate
             
         Returns:
             True if structure is valid
@@ -135,7 +136,7 @@ class ConfigParser:
         Raises:
             ValueError: If structure is invalid
         """
-        if not isinstance(config, dict):
+        if not isinstance(config, Mapping):
             raise ValueError("Configuration must be a dictionary")
         
         # Check for required top-level sections
@@ -146,7 +147,7 @@ class ConfigParser:
         
         # Validate API section
         api_config = config['api']
-        if not isinstance(api_config, dict):
+        if not isinstance(api_config, Mapping):
             raise ValueError("API configuration must be a dictionary")
         
         # Check for required API fields
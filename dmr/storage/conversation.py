@@ -9,12 +9,13 @@ import json
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Union
 from dataclasses import dataclass, asdict, field
 
 from ..utils.helpers import safe_get_nested
 from .index_cache import ConversationIndexCache
 from ..utils.performance import measure_performance, track_cache_performance
+from ..utils.serialization import dumps_json
 
 try:
     from openai.types.chat import ChatCompletionMessageParam
@@ -147,11 +148,55 @@ class Conversation:
         conversation.messages = [Message.from_dict(msg) for msg in data.get('messages', [])]
         return conversation
     
+    @classmethod
+    def from_dict_many(cls, items: Iterable[Dict[str, Any]]) -> List['Conversation']:
+        """
+        Create conversations from an iterable of dictionaries.
+        
+        Bulk counterpart of ``from_dict`` for collection imports: the parser and
+        constructors are bound once and messages are built without a per-message
+        classmethod call. ``items`` is consumed lazily, so it may be a generator.
+        
+        Args:
+            items: Conversation dictionaries as produced by ``to_dict``
+            
+        Returns:
+            List of conversations in input order
+        """
+        parse_timestamp = datetime.fromisoformat
+        metadata_from_dict = ConversationMetadata.from_dict
+        make_message = Message
+        
+        conversations = []
+        for data in items:
+            conversation = cls(id=data['id'], metadata=metadata_from_dict(data['metadata']))
+            
+            messages = []
+            for message_data in data.get('messages', ()):
+                fields = dict(message_data)
+                timestamp = fields.get('timestamp')
+                if isinstance(timestamp, str):
+                    fields['timestamp'] = parse_timestamp(timestamp)
+                messages.append(make_message(**fields))
+            
+            conversation.messages = messages
+            conversations.append(conversation)
+        
+        return conversations
+    
     def save(self, file_path: Path) -> None:
         """Save conversation to file."""
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        # Same layout as to_dict, but the encoder formats dataclasses and
+        # datetimes itself; encode to UTF-8 bytes once and write them in one call
+        data = {
+            'id': self.id,
+            'metadata': self.metadata,
+            'messages': self.messages,
+            'version': '1.0'
+        }
+        with open(file_path, 'wb') as f:
+            f.write(dumps_json(data, indent=2))
         self._storage_path = file_path
     
     @classmethod
@@ -230,7 +275,7 @@ class ConversationManager:
         return conversation
     
     @track_cache_performance("conversation_list")
-    def list_conversations(self) -> List[Dict[str, Any]]:
+    def list_conversations(self) -> List[Mapping[str, Any]]:
         """List all available conversations with metadata using optimized index cache."""
         return self._index_cache.get_all_metadata()
     
@@ -261,9 +306,10 @@ class ConversationManager:
         return self._current_conversation
     
     @measure_performance("conversation_search", include_args=True)
-    def search_conversations(self, query: str, search_content: bool = False) -> List[Dict[str, Any]]:
+    def search_conversations(self, query: str, search_content: bool = False,
+                             limit: Optional[int] = None) -> List[Mapping[str, Any]]:
         """Search conversations using optimized index cache."""
-        return self._index_cache.search_metadata(query, search_content)
+        return self._index_cache.search_metadata(query, search_content, limit)
     
     def enable_auto_save(self, conversation: Conversation) -> None:
         """Enable auto-save for a conversation."""
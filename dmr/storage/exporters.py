@@ -5,24 +5,88 @@ This module provides export format selection, routing, and configuration
 management for conversation exports.
 """
 
+import asyncio
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Type
+from typing import IO, Dict, List, Optional, Any, Set, Tuple, Type
 from enum import Enum
 
 from .conversation import Conversation
 
 
+# Exports are disk-bound, so allow more threads than cores
+_MAX_EXPORT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Default cap on exports in flight for export_batch_async
+_MAX_ASYNC_EXPORTS = 32
+
+
+def _unique_output_paths(conversations: List[Conversation], output_paths: List[Path]) -> List[Path]:
+    """
+    Make output paths distinct so concurrent exports never share a file.
+    
+    Repeated paths, e.g. default filenames of conversations with the same
+    title and creation second, get the conversation ID prefix and, if still
+    taken, a counter appended to the file stem.
+    
+    Args:
+        conversations: Conversations being exported
+        output_paths: Requested destination for each conversation
+        
+    Returns:
+        Destination for each conversation, in input order
+    """
+    seen: Set[Path] = set()
+    unique_paths = []
+    for conversation, output_path in zip(conversations, output_paths):
+        candidate = output_path
+        if candidate in seen:
+            stem = f"{output_path.stem}_{conversation.id[:8]}"
+            candidate = output_path.with_name(f"{stem}{output_path.suffix}")
+            counter = 2
+            while candidate in seen:
+                candidate = output_path.with_name(f"{stem}_{counter}{output_path.suffix}")
+                counter += 1
+        seen.add(candidate)
+        unique_paths.append(candidate)
+    return unique_paths
+
+
+def _export_in_process(exporter_type: Type['BaseExporter'], conversation: Conversation,
+                       output_path: Path, options: Dict[str, Any]) -> Path:
+    """Run one export in a worker process of BaseExporter.export_many."""
+    return exporter_type().export(conversation, output_path, options)
+
+
 class ExportFormat(Enum):
     """Supported export formats."""
     JSON = "json"
     MARKDOWN = "markdown"
     PDF = "pdf"
+    MSGPACK = "msgpack"
+
+
+class _ValidatedOptions(dict):
+    """Options already processed by a specific exporter's validate_options."""
+    
+    def __init__(self, options: Dict[str, Any], exporter_type: type):
+        super().__init__(options)
+        self.exporter_type = exporter_type
 
 
 class BaseExporter(ABC):
     """Base class for all conversation exporters."""
     
+    # Characters in titles that are unsafe in filenames, replaced in one pass
+    _FILENAME_TABLE = str.maketrans({' ': '_', '/': '_', '\\': '_', ':': '_'})
+    _FILENAME_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+    
+    # Buffer size for exporters writing their output file directly
+    _WRITE_BUFFER_SIZE = 1 << 20
+    
     @property
     @abstractmethod
     def format_name(self) -> str:
@@ -51,10 +115,114 @@ class BaseExporter(ABC):
         """Validate and process export options."""
         return options or {}
     
+    def prepare_options(self, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate options unless this exporter type has already validated them.
+        
+        Args:
+            options: Raw options, or the result of a previous prepare_options call
+            
+        Returns:
+            Validated options, marked so later calls can pass them through
+        """
+        if isinstance(options, _ValidatedOptions) and options.exporter_type is type(self):
+            return options
+        return _ValidatedOptions(self.validate_options(options or {}), type(self))
+    
+    async def export_async(self, conversation: Conversation, output_path: Path,
+                           options: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Export a conversation without blocking the event loop.
+        
+        Encoding and file writes run in the loop's default thread pool.
+        
+        Args:
+            conversation: Conversation to export
+            output_path: Destination file
+            options: Export options
+            
+        Returns:
+            Path of the exported file
+        """
+        return await asyncio.to_thread(self.export, conversation, output_path, options)
+    
+    async def export_batch_async(self, conversations: List[Conversation], output_paths: List[Path],
+                                 options: Optional[Dict[str, Any]] = None,
+                                 max_concurrency: int = _MAX_ASYNC_EXPORTS) -> List[Path]:
+        """
+        Export many conversations concurrently, one file each.
+        
+        Args:
+            conversations: Conversations to export
+            output_paths: Destination file for each conversation; repeated
+                paths are made unique
+            options: Export options shared by every export
+            max_concurrency: Maximum number of exports in flight
+            
+        Returns:
+            Exported paths in input order
+        """
+        if len(conversations) != len(output_paths):
+            raise ValueError("conversations and output_paths must have the same length")
+        
+        output_paths = _unique_output_paths(conversations, output_paths)
+        validated_options = self.prepare_options(options)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def export_one(conversation: Conversation, output_path: Path) -> Path:
+            async with semaphore:
+                return await self.export_async(conversation, output_path, validated_options)
+        
+        return list(await asyncio.gather(*(
+            export_one(conversation, output_path)
+            for conversation, output_path in zip(conversations, output_paths)
+        )))
+    
+    def export_many(self, conversations: List[Conversation], output_paths: List[Path],
+                    options: Optional[Dict[str, Any]] = None,
+                    max_workers: Optional[int] = None) -> List[Path]:
+        """
+        Export many conversations in parallel worker processes, one file each.
+        
+        Unlike the thread-based batch helpers this sidesteps the GIL, so it
+        suits CPU-heavy formats such as PDF. Conversations are pickled to the
+        workers and each worker builds its own exporter of this type.
+        
+        Args:
+            conversations: Conversations to export
+            output_paths: Destination file for each conversation; repeated
+                paths are made unique
+            options: Export options shared by every export
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Exported paths in input order
+        """
+        if len(conversations) != len(output_paths):
+            raise ValueError("conversations and output_paths must have the same length")
+        
+        output_paths = _unique_output_paths(conversations, output_paths)
+        validated_options = dict(self.prepare_options(options))
+        workers = max_workers or os.cpu_count() or 1
+        # Several exports per task keep pickling round trips low for large batches
+        chunksize = max(1, len(conversations) // (workers * 4))
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                _export_in_process, repeat(type(self)), conversations, output_paths,
+                repeat(validated_options), chunksize=chunksize
+            ))
+    
+    @staticmethod
+    def _sync_file(f: IO) -> None:
+        """Flush a file and force it to disk; used when the 'fsync' option is set."""
+        f.flush()
+        os.fsync(f.fileno())
+    
     def get_default_filename(self, conversation: Conversation) -> str:
         """Generate default filename for the conversation."""
-        title = conversation.metadata.title.replace(" ", "_").replace("/", "_")
-        timestamp = conversation.metadata.created_at.strftime("%Y%m%d_%H%M%S")
+        title = conversation.metadata.title.translate(self._FILENAME_TABLE)
+        timestamp = conversation.metadata.created_at.strftime(self._FILENAME_TIMESTAMP_FORMAT)
         return f"{title}_{timestamp}.{self.file_extension}"
 
 
@@ -67,11 +235,18 @@ class ExportManager:
     
     def _register_default_exporters(self) -> None:
         """Register default exporters."""
-        from .formats import JSONExporter, MarkdownExporter, PDFExporter
+        from .formats import (
+            JSONExporter, MarkdownExporter, PDFExporter,
+            MessagePackExporter, MSGPACK_AVAILABLE
+        )
         
         self.register_exporter(JSONExporter())
         self.register_exporter(MarkdownExporter())
         self.register_exporter(PDFExporter())
+        
+        # Binary archive format, only offered when msgpack is installed
+        if MSGPACK_AVAILABLE:
+            self.register_exporter(MessagePackExporter())
     
     def register_exporter(self, exporter: BaseExporter) -> None:
         """Register a new exporter."""
@@ -94,12 +269,23 @@ class ExportManager:
     
     def export_conversation(self, conversation: Conversation, format_name: str, 
                           output_path: Optional[Path] = None, 
-                          options: Optional[Dict[str, Any]] = None) -> Path:
-        """Export conversation in specified format."""
-        exporter = self.get_exporter(format_name)
-        if not exporter:
-            available = list(self._exporters.keys())
-            raise ValueError(f"Unsupported format '{format_name}'. Available: {available}")
+                          options: Optional[Dict[str, Any]] = None,
+                          skip_mkdir: bool = False) -> Path:
+        """
+        Export conversation in specified format.
+        
+        Args:
+            conversation: Conversation to export
+            format_name: Name of a registered export format
+            output_path: Destination file, defaults to ./exports/<default filename>
+            options: Exporter-specific options
+            skip_mkdir: Assume the output directory already exists (batch callers
+                create it once up front)
+            
+        Returns:
+            Path of the exported file
+        """
+        exporter = self._require_exporter(format_name)
         
         # Generate output path if not provided
         if output_path is None:
@@ -107,10 +293,11 @@ class ExportManager:
             output_path = Path.cwd() / "exports" / default_filename
         
         # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not skip_mkdir:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Validate options
-        validated_options = exporter.validate_options(options or {})
+        validated_options = exporter.prepare_options(options)
         
         # Perform export
         return exporter.export(conversation, output_path, validated_options)
@@ -122,23 +309,21 @@ class ExportManager:
         if output_dir is None:
             output_dir = Path.cwd() / "exports"
         
+        # Created once here; per-conversation exports never touch the directory again
         output_dir.mkdir(parents=True, exist_ok=True)
-        exported_files = []
         
-        for conversation in conversations:
-            exporter = self.get_exporter(format_name)
-            if exporter:
-                filename = exporter.get_default_filename(conversation)
-                output_path = output_dir / filename
-                try:
-                    exported_path = self.export_conversation(
-                        conversation, format_name, output_path, options
-                    )
-                    exported_files.append(exported_path)
-                except Exception as e:
-                    print(f"Failed to export conversation {conversation.id}: {e}")
+        # Looked up once for the whole batch; unknown formats export nothing
+        exporter = self.get_exporter(format_name)
+        if not exporter:
+            return []
         
-        return exported_files
+        # Options are validated once for the whole batch
+        validated_options = exporter.prepare_options(options)
+        jobs = [
+            (exporter, conversation, output_dir / exporter.get_default_filename(conversation), validated_options)
+            for conversation in conversations
+        ]
+        return [path for path in self._run_export_jobs(jobs) if path is not None]
     
     def create_export_bundle(self, conversations: List[Conversation], 
                            formats: List[str], output_dir: Optional[Path] = None,
@@ -147,16 +332,71 @@ class ExportManager:
         if output_dir is None:
             output_dir = Path.cwd() / "exports"
         
-        results = {}
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Submit every (conversation, format) pair to a single pool
+        jobs = []
+        job_formats = []
         for format_name in formats:
             try:
-                exported_files = self.export_multiple(
-                    conversations, format_name, output_dir, options
-                )
-                results[format_name] = exported_files
+                exporter = self._require_exporter(format_name)
+                validated_options = exporter.prepare_options(options)
             except Exception as e:
                 print(f"Failed to export in format {format_name}: {e}")
-                results[format_name] = []
+                continue
+            for conversation in conversations:
+                jobs.append((exporter, conversation,
+                             output_dir / exporter.get_default_filename(conversation),
+                             validated_options))
+                job_formats.append(format_name)
+        
+        results: Dict[str, List[Path]] = {format_name: [] for format_name in formats}
+        for format_name, path in zip(job_formats, self._run_export_jobs(jobs)):
+            if path is not None:
+                results[format_name].append(path)
+        
+        return results
+    
+    def _require_exporter(self, format_name: str) -> BaseExporter:
+        """Get exporter by format name, raising if it is not registered."""
+        exporter = self.get_exporter(format_name)
+        if not exporter:
+            available = list(self._exporters.keys())
+            raise ValueError(f"Unsupported format '{format_name}'. Available: {available}")
+        return exporter
+    
+    def _run_export_jobs(self, jobs: List[Tuple[BaseExporter, Conversation, Path, Dict[str, Any]]]) -> List[Optional[Path]]:
+        """
+        Run independent export jobs concurrently.
+        
+        Args:
+            jobs: (exporter, conversation, output_path, validated_options) tuples
+            
+        Returns:
+            Exported paths in job order, with None for failed exports
+        """
+        results: List[Optional[Path]] = [None] * len(jobs)
+        if not jobs:
+            return results
+        
+        # Jobs run concurrently, so two of them must never write the same file
+        output_paths = _unique_output_paths([job[1] for job in jobs], [job[2] for job in jobs])
+        jobs = [
+            (exporter, conversation, output_path, validated_options)
+            for (exporter, conversation, _, validated_options), output_path in zip(jobs, output_paths)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=min(_MAX_EXPORT_WORKERS, len(jobs))) as executor:
+            futures = {
+                executor.submit(exporter.export, conversation, output_path, validated_options): index
+                for index, (exporter, conversation, output_path, validated_options) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Failed to export conversation {jobs[index][1].id}: {e}")
         
         return results
     
@@ -180,37 +420,17 @@ class ExportOptions:
     @staticmethod
     def json_options() -> Dict[str, Any]:
         """Default options for JSON export."""
-        return {
-            'include_metadata': True,
-            'include_timestamps': True,
-            'pretty_print': True,
-            'include_message_metadata': False
-        }
+        from .formats.json_exporter import _DEFAULT_JSON_OPTIONS
+        return dict(_DEFAULT_JSON_OPTIONS)
     
     @staticmethod
     def markdown_options() -> Dict[str, Any]:
         """Default options for Markdown export."""
-        return {
-            'include_metadata': True,
-            'include_timestamps': True,
-            'use_code_blocks': True,
-            'add_table_of_contents': False,
-            'custom_css': None,
-            'template': 'default'
-        }
+        from .formats.markdown_exporter import _DEFAULT_MARKDOWN_OPTIONS
+        return dict(_DEFAULT_MARKDOWN_OPTIONS)
     
     @staticmethod
     def pdf_options() -> Dict[str, Any]:
         """Default options for PDF export."""
-        return {
-            'include_metadata': True,
-            'include_timestamps': True,
-            'page_size': 'A4',
-            'margin': '1in',
-            'font_family': 'Arial',
-            'font_size': 12,
-            'add_page_numbers': True,
-            'add_header': True,
-            'add_footer': True,
-            'custom_css': None
-        }
\ No newline at end of file
+        from .formats.pdf_exporter import _DEFAULT_PDF_OPTIONS
+        return dict(_DEFAULT_PDF_OPTIONS)
@@ -7,9 +7,12 @@ This package provides various export format implementations for conversations.
 from .json_exporter import JSONExporter
 from .markdown_exporter import MarkdownExporter
 from .pdf_exporter import PDFExporter
+from .msgpack_exporter import MessagePackExporter, MSGPACK_AVAILABLE
 
 __all__ = [
     'JSONExporter',
     'MarkdownExporter', 
-    'PDFExporter'
+    'PDFExporter',
+    'MessagePackExporter',
+    'MSGPACK_AVAILABLE'
 ]
\ No newline at end of file
@@ -5,12 +5,284 @@ This module provides JSON export functionality with metadata preservation
 and import capabilities.
 """
 
+import gzip
 import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Any, Tuple
 
-from ..conversation import Conversation
+from ..conversation import Conversation, Message
 from ..exporters import BaseExporter
+from ...utils.fileio import AsyncChunkWriter
+from ...utils.serialization import ORJSON_AVAILABLE, dumps_json, loads_json
+
+try:
+    import ijson  # type: ignore[import-untyped]
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+try:
+    import zstandard  # type: ignore[import-untyped]
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+try:
+    import fastjsonschema  # type: ignore[import-untyped]
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    fastjsonschema = None
+    FASTJSONSCHEMA_AVAILABLE = False
+
+
+# Shape every imported message list must have; compiled once when fastjsonschema is installed
+_MESSAGES_SCHEMA = {
+    'type': 'array',
+    'items': {'type': 'object', 'required': ['role', 'content']}
+}
+_MESSAGES_VALIDATOR = fastjsonschema.compile(_MESSAGES_SCHEMA) if FASTJSONSCHEMA_AVAILABLE else None
+
+
+def _messages_well_formed(messages: List[Any]) -> bool:
+    """
+    Check that every message is a dictionary with 'role' and 'content' fields.
+    
+    Args:
+        messages: Decoded 'messages' list
+        
+    Returns:
+        True if all messages are well formed
+    """
+    if _MESSAGES_VALIDATOR is not None:
+        try:
+            _MESSAGES_VALIDATOR(messages)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+    return all(type(message) is dict and 'role' in message and 'content' in message
+               for message in messages)
+
+
+# Streaming export tuning: large OS-level buffer, flush accumulated bytes in bulk
+_STREAM_BUFFER_SIZE = 1 << 20
+_STREAM_FLUSH_SIZE = 256 * 1024
+
+
+
+@lru_cache(maxsize=None)
+def _stream_fragments(indent: Optional[int]) -> Dict[str, bytes]:
+    """
+    Build the UTF-8 skeleton fragments for a single-conversation export.
+    
+    Args:
+        indent: Indentation width for the document skeleton, or None for compact
+        
+    Returns:
+        Fragment name to bytes mapping
+    """
+    if indent is None:
+        return {
+            'open': b'{"export_info":',
+            'conversation': b',"conversation":{"id":',
+            'metadata': b',"metadata":',
+            'messages': b',"messages":[',
+            'message_prefix': b'',
+            'message_separator': b',',
+            'close': b']}}',
+        }
+    
+    p1, p2, p3 = (' ' * (indent * level) for level in (1, 2, 3))
+    fragments = {
+        'open': f'{{\n{p1}"export_info": ',
+        'conversation': f',\n{p1}"conversation": {{\n{p2}"id": ',
+        'metadata': f',\n{p2}"metadata": ',
+        'messages': f',\n{p2}"messages": [',
+        'message_prefix': f'\n{p3}',
+        'message_separator': f',\n{p3}',
+        'close': f'\n{p2}]\n{p1}}}\n}}',
+    }
+    return {name: fragment.encode('utf-8') for name, fragment in fragments.items()}
+
+
+@lru_cache(maxsize=None)
+def _collection_fragments(indent: Optional[int]) -> Dict[str, bytes]:
+    """
+    Build the UTF-8 skeleton fragments for a conversation collection export.
+    
+    Args:
+        indent: Indentation width for the document skeleton, or None for compact
+        
+    Returns:
+        Fragment name to bytes mapping
+    """
+    if indent is None:
+        return {
+            'open': b'{"export_info":',
+            'conversations': b',"conversations":[',
+            'conversation_open': b'{"id":',
+            'metadata': b',"metadata":',
+            'messages': b',"messages":[',
+            'message_prefix': b'',
+            'message_separator': b',',
+            'messages_close': b']',
+            'conversation_close': b'}',
+            'conversation_separator': b',',
+            'close': b']}',
+        }
+    
+    p1, p2, p3, p4 = (' ' * (indent * level) for level in (1, 2, 3, 4))
+    fragments = {
+        'open': f'{{\n{p1}"export_info": ',
+        'conversations': f',\n{p1}"conversations": [\n',
+        'conversation_open': f'{p2}{{\n{p3}"id": ',
+        'metadata': f',\n{p3}"metadata": ',
+        'messages': f',\n{p3}"messages": [',
+        'message_prefix': f'\n{p4}',
+        'message_separator': f',\n{p4}',
+        'messages_close': f'\n{p3}]',
+        'conversation_close': f'\n{p2}}}',
+        'conversation_separator': ',\n',
+        'close': f'\n{p1}]\n}}',
+    }
+    return {name: fragment.encode('utf-8') for name, fragment in fragments.items()}
+
+
+# Per-message key fragments, emitted directly from Message attributes
+_MESSAGE_ROLE = b'{"role":'
+_MESSAGE_CONTENT = b',"content":'
+_MESSAGE_TIMESTAMP = b',"timestamp":'
+_MESSAGE_METADATA = b',"metadata":'
+_MESSAGE_END = b'}'
+
+# Default export options; read-only so callers copy rather than mutate
+_DEFAULT_JSON_OPTIONS = MappingProxyType({
+    'include_metadata': True,
+    'include_timestamps': True,
+    'pretty_print': True,
+    'include_message_metadata': False,
+    'indent': 2,
+    'ensure_ascii': False,
+    'compress': None,
+    'fsync': False
+})
+
+# Supported values of the 'compress' option and the suffix each appends
+_COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+_GZIP_LEVEL = 4
+_ZSTD_LEVEL = 3
+
+# Documents parsed by validate_import_file, keyed by (path, mtime_ns, size).
+# The next import of the same unchanged file takes the entry instead of
+# parsing again; entries are removed on use so imports never share objects.
+_VALIDATED_DOCUMENTS: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+_VALIDATED_DOCUMENTS_MAX = 8
+_VALIDATED_DOCUMENTS_LOCK = threading.Lock()
+
+# Uncompressed files above this size are memory-mapped for parsing
+_MMAP_THRESHOLD = 1 << 20
+
+
+def _compressed_path(output_path: Path, compress: Optional[str]) -> Path:
+    """Append the compression suffix to output_path unless it is already present."""
+    if not compress:
+        return output_path
+    suffix = _COMPRESSION_SUFFIXES[compress]
+    if output_path.name.endswith(suffix):
+        return output_path
+    return output_path.with_name(output_path.name + suffix)
+
+
+@contextmanager
+def _open_output(output_path: Path, compress: Optional[str],
+                 buffering: int = -1, fsync: bool = False) -> Iterator[BinaryIO]:
+    """
+    Open a binary output file, optionally through a compressing stream.
+    
+    Args:
+        output_path: File to create
+        compress: None, 'gzip' or 'zstd'
+        buffering: Buffer size for the underlying file
+        fsync: Force the file to disk once everything has been written
+        
+    Yields:
+        Writable binary file object
+    """
+    with open(output_path, 'wb', buffering=buffering) as raw:
+        if compress == 'gzip':
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=_GZIP_LEVEL) as f:
+                yield f
+        elif compress == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+            with compressor.stream_writer(raw, closefd=False) as f:
+                yield f
+        else:
+            yield raw
+        if fsync:
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+def _open_input(file_path: Path) -> BinaryIO:
+    """Open a JSON file for binary reading, decompressing by file suffix."""
+    name = os.fspath(file_path)
+    if name.endswith(_COMPRESSION_SUFFIXES['gzip']):
+        return gzip.open(file_path, 'rb')
+    if name.endswith(_COMPRESSION_SUFFIXES['zstd']):
+        if not ZSTD_AVAILABLE:
+            raise ImportError("Reading .zst files requires the 'zstandard' package: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    return open(file_path, 'rb')
+
+
+def _is_uncompressed(file_path: Path) -> bool:
+    """Check whether a file is read as-is rather than through a decompressor."""
+    return not os.fspath(file_path).endswith(tuple(_COMPRESSION_SUFFIXES.values()))
+
+
+def _load_json(file_path: Path, keep: bool = False) -> Any:
+    """
+    Load a JSON document, reusing a copy parsed by a previous validation.
+    
+    Args:
+        file_path: JSON file to load
+        keep: Retain the parsed document for the next load of the same file
+        
+    Returns:
+        Decoded JSON document
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    with _VALIDATED_DOCUMENTS_LOCK:
+        data = _VALIDATED_DOCUMENTS.pop(key, None)
+    
+    if data is None:
+        if ORJSON_AVAILABLE and stat.st_size > _MMAP_THRESHOLD and _is_uncompressed(file_path):
+            # orjson parses straight from the mapped pages, skipping the bytes copy
+            with open(file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                data = loads_json(view)
+        else:
+            with _open_input(file_path) as f:
+                data = loads_json(f.read())
+    
+    if keep:
+        with _VALIDATED_DOCUMENTS_LOCK:
+            _VALIDATED_DOCUMENTS[key] = data
+            while len(_VALIDATED_DOCUMENTS) > _VALIDATED_DOCUMENTS_MAX:
+                _VALIDATED_DOCUMENTS.popitem(last=False)
+    
+    return data
 
 
 class JSONExporter(BaseExporter):
@@ -30,16 +302,7 @@ class JSONExporter(BaseExporter):
     
     def validate_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
         """Validate JSON export options."""
-        default_options = {
-            'include_metadata': True,
-            'include_timestamps': True,
-            'pretty_print': True,
-            'include_message_metadata': False,
-            'indent': 2,
-            'ensure_ascii': False
-        }
-        
-        validated = default_options.copy()
+        validated = dict(_DEFAULT_JSON_OPTIONS)
         if options:
             validated.update(options)
         
@@ -47,150 +310,161 @@ class JSONExporter(BaseExporter):
         if 'indent' in validated and not isinstance(validated['indent'], int):
             validated['indent'] = 2
         
+        compress = validated.get('compress') or None
+        if compress is not None and compress not in _COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Unsupported compression '{compress}'. Available: {list(_COMPRESSION_SUFFIXES)}"
+            )
+        if compress == 'zstd' and not ZSTD_AVAILABLE:
+            raise ImportError("zstd compression requires the 'zstandard' package: pip install zstandard")
+        validated['compress'] = compress
+        
         return validated
     
     def export(self, conversation: Conversation, output_path: Path, 
                options: Optional[Dict[str, Any]] = None) -> Path:
-        """Export conversation to JSON format with streaming for large conversations."""
-        validated_options = self.validate_options(options)
-        
-        # Use streaming export for large conversations (>1000 messages)
-        if len(conversation.messages) > 1000:
-            return self._export_streaming(conversation, output_path, validated_options)
-        else:
-            return self._export_buffered(conversation, output_path, validated_options)
-    
-    def _export_buffered(self, conversation: Conversation, output_path: Path, 
-                        options: Dict[str, Any]) -> Path:
-        """Export using traditional buffered approach for smaller conversations."""
-        # Build export data
-        export_data = self._build_export_data(conversation, options)
-        
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            if options['pretty_print']:
-                json.dump(
-                    export_data, 
-                    f, 
-                    indent=options['indent'],
-                    ensure_ascii=options['ensure_ascii']
-                )
-            else:
-                json.dump(
-                    export_data, 
-                    f, 
-                    ensure_ascii=options['ensure_ascii']
-                )
-        
-        return output_path
+        """Export conversation to JSON format."""
+        validated_options = self.prepare_options(options)
+        return self._export_streaming(conversation, output_path, validated_options)
     
     def _export_streaming(self, conversation: Conversation, output_path: Path,
                          options: Dict[str, Any]) -> Path:
-        """Export using streaming approach for large conversations."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Write opening structure
-            f.write('{\n' if options['pretty_print'] else '{')
-            
-            # Export info
-            export_info = {
-                'format': 'json',
-                'version': '1.0',
-                'exported_at': conversation.metadata.updated_at.isoformat(),
-                'exporter': 'D-Model-Runner JSON Exporter (Streaming)'
-            }
-            
-            indent = '  ' if options['pretty_print'] else ''
-            f.write(f'{indent}"export_info": ')
-            json.dump(export_info, f, ensure_ascii=options['ensure_ascii'])
-            f.write(',\n' if options['pretty_print'] else ',')
-            
-            # Start conversation object
-            f.write(f'{indent}"conversation": {{\n' if options['pretty_print'] else '"conversation":{')
-            
-            # Conversation ID
-            f.write(f'{indent}  "id": ' if options['pretty_print'] else '"id":')
-            json.dump(conversation.id, f, ensure_ascii=options['ensure_ascii'])
-            f.write(',\n' if options['pretty_print'] else ',')
+        """
+        Stream the export document to disk without building it in memory.
+        
+        Small conversations end up as a single write; large ones are flushed
+        in chunks through the background writer.
+        """
+        fragments = _stream_fragments(options['indent'] if options['pretty_print'] else None)
+        ensure_ascii = options['ensure_ascii']
+        
+        def encode(value: Any) -> bytes:
+            return dumps_json(value, ensure_ascii=ensure_ascii)
+        
+        # Export info
+        export_info = {
+            'format': 'json',
+            'version': '1.0',
+            'exported_at': conversation.metadata.updated_at,
+            'exporter': 'D-Model-Runner JSON Exporter'
+        }
+        
+        output_path = _compressed_path(output_path, options['compress'])
+        with _open_output(output_path, options['compress'], _STREAM_BUFFER_SIZE,
+                          options['fsync']) as f, \
+                AsyncChunkWriter(f) as writer:
+            buf = bytearray(fragments['open'])
+            buf += encode(export_info)
+            buf += fragments['conversation']
+            buf += encode(conversation.id)
             
             # Metadata if requested
             if options['include_metadata']:
-                f.write(f'{indent}  "metadata": ' if options['pretty_print'] else '"metadata":')
-                json.dump(conversation.metadata.to_dict(), f, ensure_ascii=options['ensure_ascii'])
-                f.write(',\n' if options['pretty_print'] else ',')
+                buf += fragments['metadata']
+                buf += encode(conversation.metadata)
             
-            # Start messages array
-            f.write(f'{indent}  "messages": [\n' if options['pretty_print'] else '"messages":[')
+            buf += fragments['messages']
             
-            # Stream messages one by one
-            for i, message in enumerate(conversation.messages):
-                if i > 0:
-                    f.write(',\n' if options['pretty_print'] else ',')
-                
-                message_data = {
-                    'role': message.role,
-                    'content': message.content
-                }
-                
-                if options['include_timestamps']:
-                    message_data['timestamp'] = message.timestamp.isoformat()
-                
-                if options['include_message_metadata'] and message.metadata:
-                    message_data['metadata'] = message.metadata
-                
-                if options['pretty_print']:
-                    f.write(f'{indent}    ')
+            # Option checks are resolved once here; the loop only writes bytes
+            write_message = self._make_message_writer(options)
+            lead = fragments['message_prefix']
+            continuation = fragments['message_separator']
+            
+            # Loop-invariant lookups bound to locals
+            messages = conversation.messages
+            put_chunk = writer.put
+            flush_size = _STREAM_FLUSH_SIZE
+            
+            # Stream messages straight from their attributes (no per-message dict);
+            # full chunks are handed to the background writer while encoding continues
+            for message in messages:
+                buf += lead
+                write_message(message, buf)
+                lead = continuation
                 
-                json.dump(message_data, f, ensure_ascii=options['ensure_ascii'])
+                if len(buf) >= flush_size:
+                    put_chunk(bytes(buf))
+                    buf.clear()
             
-            # Close messages array and conversation object
-            f.write(f'\n{indent}  ]\n' if options['pretty_print'] else ']')
-            f.write(f'{indent}}}\n' if options['pretty_print'] else '}')
-            f.write('}')
+            buf += fragments['close']
+            writer.close(bytes(buf))
         
         return output_path
     
-    def _build_export_data(self, conversation: Conversation, options: Dict[str, Any]) -> Dict[str, Any]:
-        """Build the export data structure."""
-        export_data = {
-            'export_info': {
-                'format': 'json',
-                'version': '1.0',
-                'exported_at': conversation.metadata.updated_at.isoformat(),
-                'exporter': 'D-Model-Runner JSON Exporter'
-            },
-            'conversation': {
-                'id': conversation.id,
-                'messages': []
-            }
-        }
-        
-        # Include metadata if requested
-        if options['include_metadata']:
-            export_data['conversation']['metadata'] = conversation.metadata.to_dict()
+    def _make_message_writer(self, options: Dict[str, Any]) -> Callable[[Message, bytearray], None]:
+        """
+        Build a message writer specialized for the given export options.
         
-        # Process messages
-        for message in conversation.messages:
-            message_data = {
-                'role': message.role,
-                'content': message.content
-            }
-            
-            # Include timestamps if requested
-            if options['include_timestamps']:
-                message_data['timestamp'] = message.timestamp.isoformat()
+        Args:
+            options: Validated export options
             
-            # Include message metadata if requested
-            if options['include_message_metadata'] and message.metadata:
-                message_data['metadata'] = message.metadata
+        Returns:
+            Function appending one encoded message object to a bytearray
+        """
+        ensure_ascii = options['ensure_ascii']
+        include_timestamps = options['include_timestamps']
+        include_metadata = options['include_message_metadata']
+        
+        if ORJSON_AVAILABLE and not ensure_ascii:
+            # orjson emits the same compact bytes as the fragments below, so build
+            # each record with a literal and encode it in a single call
+            def write_message(message: Message, out: bytearray) -> None:
+                record = {'role': message.role, 'content': message.content}
+                if include_timestamps:
+                    record['timestamp'] = message.timestamp
+                if include_metadata and message.metadata:
+                    record['metadata'] = message.metadata
+                out += dumps_json(record)
             
-            export_data['conversation']['messages'].append(message_data)
+            return write_message
+        
+        def encode(value: Any) -> bytes:
+            return dumps_json(value, ensure_ascii=ensure_ascii)
         
-        return export_data
+        if include_timestamps and include_metadata:
+            def write_message(message: Message, out: bytearray) -> None:
+                out += _MESSAGE_ROLE
+                out += encode(message.role)
+                out += _MESSAGE_CONTENT
+                out += encode(message.content)
+                out += _MESSAGE_TIMESTAMP
+                out += encode(message.timestamp)
+                if message.metadata:
+                    out += _MESSAGE_METADATA
+                    out += encode(message.metadata)
+                out += _MESSAGE_END
+        elif include_timestamps:
+            def write_message(message: Message, out: bytearray) -> None:
+                out += _MESSAGE_ROLE
+                out += encode(message.role)
+                out += _MESSAGE_CONTENT
+                out += encode(message.content)
+                out += _MESSAGE_TIMESTAMP
+                out += encode(message.timestamp)
+                out += _MESSAGE_END
+        elif include_metadata:
+            def write_message(message: Message, out: bytearray) -> None:
+                out += _MESSAGE_ROLE
+                out += encode(message.role)
+                out += _MESSAGE_CONTENT
+                out += encode(message.content)
+                if message.metadata:
+                    out += _MESSAGE_METADATA
+                    out += encode(message.metadata)
+                out += _MESSAGE_END
+        else:
+            def write_message(message: Message, out: bytearray) -> None:
+                out += _MESSAGE_ROLE
+                out += encode(message.role)
+                out += _MESSAGE_CONTENT
+                out += encode(message.content)
+                out += _MESSAGE_END
+        
+        return write_message
     
     def import_conversation(self, file_path: Path) -> Conversation:
         """Import conversation from JSON file."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json(file_path)
         
         # Handle different JSON formats
         if 'conversation' in data:
@@ -208,8 +482,8 @@ class JSONExporter(BaseExporter):
     def validate_import_file(self, file_path: Path) -> Dict[str, Any]:
         """Validate JSON file for import."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Keep the parsed document so a following import does not parse again
+            data = _load_json(file_path, keep=True)
             
             validation_result = {
                 'valid': True,
@@ -242,17 +516,18 @@ class JSONExporter(BaseExporter):
                 else:
                     validation_result['info']['message_count'] = len(messages)
                     
-                    # Validate message structure
-                    for i, message in enumerate(messages):
-                        if not isinstance(message, dict):
-                            validation_result['errors'].append(f"Message {i} is not a dictionary")
-                            continue
+                    # Walk messages one by one only to report problems the bulk check found
+                    if not _messages_well_formed(messages):
+                        for i, message in enumerate(messages):
+                            if not isinstance(message, dict):
+                                validation_result['errors'].append(f"Message {i} is not a dictionary")
+                                continue
                         
-                        if 'role' not in message:
-                            validation_result['errors'].append(f"Message {i} missing 'role' field")
+                            if 'role' not in message:
+                                validation_result['errors'].append(f"Message {i} missing 'role' field")
                         
-                        if 'content' not in message:
-                            validation_result['errors'].append(f"Message {i} missing 'content' field")
+                            if 'content' not in message:
+                                validation_result['errors'].append(f"Message {i} missing 'content' field")
             
             # Check metadata
             if 'metadata' in conversation_data:
@@ -286,52 +561,118 @@ class JSONExporter(BaseExporter):
                                     output_path: Path, 
                                     options: Optional[Dict[str, Any]] = None) -> Path:
         """Export multiple conversations to a single JSON file."""
-        validated_options = self.validate_options(options)
-        
-        export_data = {
-            'export_info': {
-                'format': 'json_collection',
-                'version': '1.0',
-                'exported_at': conversations[0].metadata.updated_at.isoformat() if conversations else "",
-                'exporter': 'D-Model-Runner JSON Exporter',
-                'conversation_count': len(conversations)
-            },
-            'conversations': []
+        validated_options = self.prepare_options(options)
+        fragments = _collection_fragments(
+            validated_options['indent'] if validated_options['pretty_print'] else None
+        )
+        ensure_ascii = validated_options['ensure_ascii']
+        include_metadata = validated_options['include_metadata']
+        
+        def encode(value: Any) -> bytes:
+            return dumps_json(value, ensure_ascii=ensure_ascii)
+        
+        export_info = {
+            'format': 'json_collection',
+            'version': '1.0',
+            'exported_at': conversations[0].metadata.updated_at if conversations else "",
+            'exporter': 'D-Model-Runner JSON Exporter',
+            'conversation_count': len(conversations)
         }
         
-        for conversation in conversations:
-            conversation_data = self._build_export_data(conversation, validated_options)
-            export_data['conversations'].append(conversation_data['conversation'])
-        
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            if validated_options['pretty_print']:
-                json.dump(
-                    export_data, 
-                    f, 
-                    indent=validated_options['indent'],
-                    ensure_ascii=validated_options['ensure_ascii']
-                )
-            else:
-                json.dump(
-                    export_data, 
-                    f, 
-                    ensure_ascii=validated_options['ensure_ascii']
-                )
+        write_message = self._make_message_writer(validated_options)
+        message_lead = fragments['message_prefix']
+        message_continuation = fragments['message_separator']
+        
+        # Conversations sharing a metadata object reuse its encoded bytes; the
+        # conversations list keeps every metadata object alive, so ids are stable
+        metadata_cache: Dict[int, bytes] = {}
+        
+        output_path = _compressed_path(output_path, validated_options['compress'])
+        with _open_output(output_path, validated_options['compress'], _STREAM_BUFFER_SIZE,
+                          validated_options['fsync']) as f, \
+                AsyncChunkWriter(f) as writer:
+            buf = bytearray(fragments['open'])
+            buf += encode(export_info)
+            buf += fragments['conversations']
+            
+            put_chunk = writer.put
+            flush_size = _STREAM_FLUSH_SIZE
+            
+            conversation_lead = b''
+            for conversation in conversations:
+                buf += conversation_lead
+                buf += fragments['conversation_open']
+                buf += encode(conversation.id)
+                
+                if include_metadata:
+                    metadata = conversation.metadata
+                    encoded_metadata = metadata_cache.get(id(metadata))
+                    if encoded_metadata is None:
+                        encoded_metadata = encode(metadata)
+                        metadata_cache[id(metadata)] = encoded_metadata
+                    buf += fragments['metadata']
+                    buf += encoded_metadata
+                
+                buf += fragments['messages']
+                lead = message_lead
+                for message in conversation.messages:
+                    buf += lead
+                    write_message(message, buf)
+                    lead = message_continuation
+                    
+                    if len(buf) >= flush_size:
+                        put_chunk(bytes(buf))
+                        buf.clear()
+                buf += fragments['messages_close']
+                buf += fragments['conversation_close']
+                conversation_lead = fragments['conversation_separator']
+                
+                # Also flush between conversations so batches of short
+                # conversations never accumulate in memory
+                if len(buf) >= flush_size:
+                    put_chunk(bytes(buf))
+                    buf.clear()
+            
+            buf += fragments['close']
+            writer.close(bytes(buf))
         
         return output_path
     
     def import_multiple_conversations(self, file_path: Path) -> List[Conversation]:
         """Import multiple conversations from JSON file."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if IJSON_AVAILABLE:
+            return self._import_multiple_incremental(file_path)
+        
+        data = _load_json(file_path)
         
         if 'conversations' not in data:
             raise ValueError("Invalid JSON format for multiple conversation import")
         
-        conversations = []
-        for conversation_data in data['conversations']:
-            conversation = Conversation.from_dict(conversation_data)
-            conversations.append(conversation)
+        return Conversation.from_dict_many(data['conversations'])
+    
+    def _import_multiple_incremental(self, file_path: Path) -> List[Conversation]:
+        """
+        Import a conversation collection one conversation at a time with ijson.
+        
+        Only a single conversation's decoded objects are alive at once, instead
+        of the whole collection document.
+        
+        Args:
+            file_path: JSON collection file
+            
+        Returns:
+            List of imported conversations
+        """
+        with _open_input(file_path) as f:
+            conversations = Conversation.from_dict_many(
+                ijson.items(f, 'conversations.item', use_float=True)
+            )
+        
+        if not conversations:
+            # An empty result is either an empty collection or the wrong format
+            with _open_input(file_path) as f:
+                keys = {key for key, _ in ijson.kvitems(f, '', use_float=True)}
+            if 'conversations' not in keys:
+                raise ValueError("Invalid JSON format for multiple conversation import")
         
-        return conversations
\ No newline at end of file
+        return conversations
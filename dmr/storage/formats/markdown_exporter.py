@@ -5,13 +5,118 @@ This module provides Markdown export functionality with formatting, styling,
 and template support.
 """
 
+import io
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, Optional, Any, TextIO
 from datetime import datetime
 
 from ..conversation import Conversation
 from ..exporters import BaseExporter
+from ...utils.helpers import timestamp_formatter
+
+
+# Markdown special characters, escaped with a backslash. Most messages contain
+# none, so a regex search decides first whether the translate pass is needed
+_MD_SPECIAL_CHARS = '\\`*_{}[]()#+-.!'
+_MD_SPECIAL_RE = re.compile('[' + re.escape(_MD_SPECIAL_CHARS) + ']')
+_MD_ESCAPE_TABLE = str.maketrans({char: '\\' + char for char in _MD_SPECIAL_CHARS})
+
+# Substrings (matched against lowercased content) that mark a message as code
+_CODE_INDICATORS = (
+    'def ', 'class ', 'import ', 'from ', 'function', 'var ', 'const ', 'let ',
+    '#!/', '<?', '<html', '<div', '{', '}', ';', '  ', '\t'
+)
+_CODE_INDICATOR_RE = re.compile('|'.join(map(re.escape, _CODE_INDICATORS)))
+
+# Special characters counted by the code heuristic. All are ASCII, so they can
+# be counted on the UTF-8 bytes with bytes.translate, which stays in a tight C
+# loop even for non-ASCII text (str.translate falls back to a per-character path)
+_SPECIAL_BYTES = b'{}[]();,=<>!@#$%^&*'
+
+# Language indicators in detection priority order. 'from ' is listed only for
+# python, which is checked before sql anyway.
+_LANGUAGE_INDICATORS = (
+    ('python', ('def ', 'import ', 'from ', 'print(', 'if __name__')),
+    ('javascript', ('function ', 'var ', 'const ', 'let ', 'console.log')),
+    ('html', ('<html', '<div', '<span', '<p>', '<!doctype')),
+    ('css', ('color:', 'margin:', 'padding:', 'font-size:')),
+    ('sql', ('select ', 'where ', 'insert ', 'update ')),
+    ('bash', ('echo ', 'cd ', 'ls ', 'grep ')),
+)
+_LANGUAGE_PRIORITY = {language: rank for rank, (language, _) in enumerate(_LANGUAGE_INDICATORS)}
+
+# _LANG_SEARCH[r] matches the indicators of every language ranked above r, one
+# named group per language in priority order, so at any given position the
+# higher-priority language wins the alternation
+_LANG_SEARCH = [
+    re.compile('|'.join(
+        f"(?P<{language}>{'|'.join(map(re.escape, indicators))})"
+        for language, indicators in _LANGUAGE_INDICATORS[:rank]
+    ))
+    for rank in range(len(_LANGUAGE_INDICATORS) + 1)
+]
+
+# Predefined option sets for apply_template; read-only, copied on request
+_MARKDOWN_TEMPLATES = MappingProxyType({
+    'default': MappingProxyType({
+        'description': 'Standard conversation format',
+        'include_metadata': True,
+        'include_timestamps': True,
+        'use_code_blocks': True,
+        'add_table_of_contents': False
+    }),
+    'clean': MappingProxyType({
+        'description': 'Clean format without metadata',
+        'include_metadata': False,
+        'include_timestamps': False,
+        'use_code_blocks': True,
+        'add_table_of_contents': False
+    }),
+    'detailed': MappingProxyType({
+        'description': 'Detailed format with all metadata and TOC',
+        'include_metadata': True,
+        'include_timestamps': True,
+        'use_code_blocks': True,
+        'add_table_of_contents': True,
+        'include_message_numbers': True
+    }),
+    'presentation': MappingProxyType({
+        'description': 'Format suitable for presentations',
+        'include_metadata': False,
+        'include_timestamps': False,
+        'use_code_blocks': True,
+        'add_table_of_contents': True,
+        'message_separator': '\n\n---\n\n'
+    }),
+})
+
+# Line breaks in table-of-contents previews become spaces
+_NL_TRANS = str.maketrans({'\n': ' ', '\r': ' '})
+
+
+@lru_cache(maxsize=32)
+def _role_title(role: str) -> str:
+    """Title-case a message role; roles repeat, so the result is cached."""
+    return role.title()
+
+
+# Default export options; read-only so callers copy rather than mutate
+_DEFAULT_MARKDOWN_OPTIONS = MappingProxyType({
+    'include_metadata': True,
+    'include_timestamps': True,
+    'use_code_blocks': True,
+    'add_table_of_contents': False,
+    'template': 'default',
+    'custom_css': None,
+    'timestamp_format': '%Y-%m-%d %H:%M:%S',
+    'message_separator': '\n---\n',
+    'escape_markdown': True,
+    'include_message_numbers': False,
+    'fsync': False
+})
 
 
 class MarkdownExporter(BaseExporter):
@@ -31,20 +136,7 @@ class MarkdownExporter(BaseExporter):
     
     def validate_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
         """Validate Markdown export options."""
-        default_options = {
-            'include_metadata': True,
-            'include_timestamps': True,
-            'use_code_blocks': True,
-            'add_table_of_contents': False,
-            'template': 'default',
-            'custom_css': None,
-            'timestamp_format': '%Y-%m-%d %H:%M:%S',
-            'message_separator': '\n---\n',
-            'escape_markdown': True,
-            'include_message_numbers': False
-        }
-        
-        validated = default_options.copy()
+        validated = dict(_DEFAULT_MARKDOWN_OPTIONS)
         if options:
             validated.update(options)
         
@@ -53,267 +145,246 @@ class MarkdownExporter(BaseExporter):
     def export(self, conversation: Conversation, output_path: Path, 
                options: Optional[Dict[str, Any]] = None) -> Path:
         """Export conversation to Markdown format."""
-        validated_options = self.validate_options(options)
-        
-        # Build markdown content
-        markdown_content = self._build_markdown_content(conversation, validated_options)
+        validated_options = self.prepare_options(options)
         
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        # Sections are written straight to the file; no intermediate document string
+        with open(output_path, 'w', encoding='utf-8', buffering=self._WRITE_BUFFER_SIZE) as f:
+            self._write_markdown_content(f, conversation, validated_options)
+            if validated_options['fsync']:
+                self._sync_file(f)
         
         return output_path
     
     def _build_markdown_content(self, conversation: Conversation, options: Dict[str, Any]) -> str:
         """Build the markdown content."""
-        lines = []
-        
+        buf = io.StringIO()
+        self._write_markdown_content(buf, conversation, options)
+        return buf.getvalue()
+    
+    def _write_markdown_content(self, out: TextIO, conversation: Conversation,
+                                options: Dict[str, Any]) -> None:
+        """
+        Write the markdown document, one newline-terminated line at a time.
+        
+        Args:
+            out: Text stream to write to (an open file or StringIO)
+            conversation: Conversation to render
+            options: Validated export options
+        """
         # Add title
         title = conversation.metadata.title
-        lines.append(f"# {self._escape_markdown(title) if options['escape_markdown'] else title}")
-        lines.append("")
+        out.write(f"# {self._escape_markdown(title) if options['escape_markdown'] else title}\n\n")
         
         # Add metadata section
         if options['include_metadata']:
-            lines.extend(self._build_metadata_section(conversation, options))
-            lines.append("")
+            self._write_metadata_section(out, conversation, options)
+            out.write("\n")
         
         # Add table of contents if requested
         if options['add_table_of_contents']:
-            lines.extend(self._build_table_of_contents(conversation))
-            lines.append("")
+            self._write_table_of_contents(out, conversation)
+            out.write("\n")
         
         # Add messages
-        lines.extend(self._build_messages_section(conversation, options))
+        self._write_messages_section(out, conversation, options)
         
         # Add custom CSS if provided
         if options['custom_css']:
-            lines.append("")
-            lines.append("<style>")
-            lines.append(options['custom_css'])
-            lines.append("</style>")
-        
-        return "\n".join(lines)
+            out.write(f"\n<style>\n{options['custom_css']}\n</style>\n")
     
-    def _build_metadata_section(self, conversation: Conversation, options: Dict[str, Any]) -> List[str]:
-        """Build metadata section."""
-        lines = ["## Conversation Metadata", ""]
-        
+    def _write_metadata_section(self, out: TextIO, conversation: Conversation,
+                                options: Dict[str, Any]) -> None:
+        """Write metadata section."""
+        write = out.write
         metadata = conversation.metadata
         
+        write("## Conversation Metadata\n\n")
+        
         # Basic metadata table
-        lines.append("| Field | Value |")
-        lines.append("|-------|-------|")
-        lines.append(f"| **ID** | `{conversation.id}` |")
-        lines.append(f"| **Title** | {self._escape_markdown(metadata.title) if options['escape_markdown'] else metadata.title} |")
-        lines.append(f"| **Model** | `{metadata.model}` |")
+        write("| Field | Value |\n")
+        write("|-------|-------|\n")
+        write(f"| **ID** | `{conversation.id}` |\n")
+        write(f"| **Title** | {self._escape_markdown(metadata.title) if options['escape_markdown'] else metadata.title} |\n")
+        write(f"| **Model** | `{metadata.model}` |\n")
         
         if options['include_timestamps']:
             created_str = metadata.created_at.strftime(options['timestamp_format'])
             updated_str = metadata.updated_at.strftime(options['timestamp_format'])
-            lines.append(f"| **Created** | {created_str} |")
-            lines.append(f"| **Updated** | {updated_str} |")
+            write(f"| **Created** | {created_str} |\n")
+            write(f"| **Updated** | {updated_str} |\n")
         
-        lines.append(f"| **Messages** | {len(conversation.messages)} |")
+        write(f"| **Messages** | {len(conversation.messages)} |\n")
         
         if metadata.tags:
             tags_str = ", ".join([f"`{tag}`" for tag in metadata.tags])
-            lines.append(f"| **Tags** | {tags_str} |")
+            write(f"| **Tags** | {tags_str} |\n")
         
         if metadata.description:
             desc = self._escape_markdown(metadata.description) if options['escape_markdown'] else metadata.description
-            lines.append(f"| **Description** | {desc} |")
+            write(f"| **Description** | {desc} |\n")
         
-        lines.append("")
+        write("\n")
         
         # Model configuration if available
         if metadata.model_config:
-            lines.append("### Model Configuration")
-            lines.append("")
+            write("### Model Configuration\n\n")
             for key, value in metadata.model_config.items():
-                lines.append(f"- **{key}**: `{value}`")
-            lines.append("")
-        
-        return lines
+                write(f"- **{key}**: `{value}`\n")
+            write("\n")
     
-    def _build_table_of_contents(self, conversation: Conversation) -> List[str]:
-        """Build table of contents."""
-        lines = ["## Table of Contents", ""]
+    def _write_table_of_contents(self, out: TextIO, conversation: Conversation) -> None:
+        """Write table of contents."""
+        write = out.write
+        write("## Table of Contents\n\n")
         
         # Add metadata link
-        lines.append("- [Conversation Metadata](#conversation-metadata)")
-        
-        # Add message links
-        for i, message in enumerate(conversation.messages, 1):
-            role_title = message.role.title()
-            # Create anchor-safe title
-            content_preview = message.content[:30].replace('\n', ' ')
-            if len(message.content) > 30:
-                content_preview += "..."
-            
-            # Clean preview for anchor
-            anchor = f"message-{i}-{role_title.lower()}"
-            lines.append(f"- [Message {i}: {role_title} - {content_preview}](#{anchor})")
-        
-        return lines
+        write("- [Conversation Metadata](#conversation-metadata)\n")
+        
+        # Add message links; newlines would break the link, so previews flatten them
+        out.writelines([
+            f"- [Message {i}: {_role_title(message.role)} - "
+            f"{message.content[:30].translate(_NL_TRANS)}{'...' if len(message.content) > 30 else ''}]"
+            f"(#message-{i}-{_role_title(message.role).lower()})\n"
+            for i, message in enumerate(conversation.messages, 1)
+        ])
     
-    def _build_messages_section(self, conversation: Conversation, options: Dict[str, Any]) -> List[str]:
-        """Build messages section."""
-        lines = ["## Conversation Messages", ""]
-        
+    def _write_messages_section(self, out: TextIO, conversation: Conversation,
+                                options: Dict[str, Any]) -> None:
+        """Write messages section."""
+        write = out.write
+        write("## Conversation Messages\n\n")
+        
+        # Option lookups hoisted out of the per-message loop
+        include_numbers = options['include_message_numbers']
+        include_timestamps = options['include_timestamps']
+        format_timestamp = timestamp_formatter(options['timestamp_format'])
+        escape = options['escape_markdown']
+        use_code_blocks = options['use_code_blocks']
+        separator_line = f"{options['message_separator']}\n"
+        
+        message_count = len(conversation.messages)
         for i, message in enumerate(conversation.messages, 1):
             # Message header
-            role_title = message.role.title()
-            if options['include_message_numbers']:
-                header = f"### Message {i}: {role_title}"
+            role_title = _role_title(message.role)
+            if include_numbers:
+                write(f"### Message {i}: {role_title}\n")
             else:
-                header = f"### {role_title}"
-            
-            lines.append(header)
+                write(f"### {role_title}\n")
             
             # Add timestamp if requested
-            if options['include_timestamps']:
-                timestamp_str = message.timestamp.strftime(options['timestamp_format'])
-                lines.append(f"*{timestamp_str}*")
-                lines.append("")
+            if include_timestamps:
+                write(f"*{format_timestamp(message.timestamp)}*\n\n")
             
             # Add message content
             content = message.content
-            if options['escape_markdown']:
+            if escape:
                 content = self._escape_markdown(content)
             
-            # Check if content looks like code and use code blocks
-            if options['use_code_blocks'] and self._is_code_content(content):
-                # Try to detect language
-                language = self._detect_code_language(content)
-                lines.append(f"```{language}")
-                lines.append(content)
-                lines.append("```")
+            # Use code blocks when content looks like code
+            language = self._code_language(content) if use_code_blocks else None
+            if language is not None:
+                write(f"```{language}\n{content}\n```\n")
             else:
-                lines.append(content)
+                write(f"{content}\n")
             
             # Add message metadata if available
             if message.metadata:
-                lines.append("")
-                lines.append("**Message Metadata:**")
+                write("\n**Message Metadata:**\n")
                 for key, value in message.metadata.items():
-                    lines.append(f"- **{key}**: `{value}`")
+                    write(f"- **{key}**: `{value}`\n")
             
             # Add separator between messages
-            if i < len(conversation.messages):
-                lines.append(options['message_separator'])
-        
-        return lines
+            if i < message_count:
+                write(separator_line)
     
     def _escape_markdown(self, text: str) -> str:
         """Escape special markdown characters."""
-        # Escape markdown special characters
-        special_chars = ['\\', '`', '*', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!']
-        escaped = text
-        for char in special_chars:
-            escaped = escaped.replace(char, f'\\{char}')
-        return escaped
+        if _MD_SPECIAL_RE.search(text) is None:
+            return text
+        return text.translate(_MD_ESCAPE_TABLE)
     
     def _is_code_content(self, content: str) -> bool:
         """Heuristically detect if content is code."""
-        code_indicators = [
-            'def ', 'class ', 'import ', 'from ', 'function', 'var ', 'const ', 'let ',
-            '#!/', '<?', '<html', '<div', '{', '}', ';', '  ', '\t'
-        ]
+        return self._is_code_lower(content, content.lower())
+    
+    def _detect_code_language(self, content: str) -> str:
+        """Detect programming language from content."""
+        return self._detect_language_lower(content, content.lower())
+    
+    def _code_language(self, content: str) -> Optional[str]:
+        """
+        Classify content for code blocks, lowercasing it only once.
         
+        Args:
+            content: Message content
+            
+        Returns:
+            Detected language ('' when unknown) if the content looks like code,
+            otherwise None
+        """
         content_lower = content.lower()
-        for indicator in code_indicators:
-            if indicator in content_lower:
-                return True
+        if not self._is_code_lower(content, content_lower):
+            return None
+        return self._detect_language_lower(content, content_lower)
+    
+    @staticmethod
+    def _is_code_lower(content: str, content_lower: str) -> bool:
+        """Code heuristic given the content and its lowercased form."""
+        if _CODE_INDICATOR_RE.search(content_lower):
+            return True
         
         # Check for high ratio of special characters
-        special_count = sum(1 for c in content if c in '{}[]();,=<>!@#$%^&*')
-        if len(content) > 0 and special_count / len(content) > 0.1:
-            return True
+        if content:
+            encoded = content.encode('utf-8', 'surrogatepass')
+            special_count = len(encoded) - len(encoded.translate(None, _SPECIAL_BYTES))
+            if special_count / len(content) > 0.1:
+                return True
         
         return False
     
-    def _detect_code_language(self, content: str) -> str:
-        """Detect programming language from content."""
-        content_lower = content.lower()
-        
-        # Python indicators
-        if any(indicator in content_lower for indicator in ['def ', 'import ', 'from ', 'print(', 'if __name__']):
-            return 'python'
-        
-        # JavaScript indicators
-        if any(indicator in content_lower for indicator in ['function ', 'var ', 'const ', 'let ', 'console.log']):
-            return 'javascript'
-        
-        # HTML indicators
-        if any(indicator in content_lower for indicator in ['<html', '<div', '<span', '<p>', '<!doctype']):
-            return 'html'
-        
-        # CSS indicators
-        if any(indicator in content_lower for indicator in ['color:', 'margin:', 'padding:', 'font-size:']):
-            return 'css'
-        
-        # SQL indicators
-        if any(indicator in content_lower for indicator in ['select ', 'from ', 'where ', 'insert ', 'update ']):
-            return 'sql'
+    @staticmethod
+    def _detect_language_lower(content: str, content_lower: str) -> str:
+        """Language detection given the content and its lowercased form."""
+        # Find the highest-priority language with any indicator present. After
+        # each hit only higher-ranked languages are searched for, resuming just
+        # past the hit (nothing earlier matched the wider pattern)
+        best_rank = len(_LANGUAGE_INDICATORS)
+        pos = 0
+        while best_rank > 0:
+            match = _LANG_SEARCH[best_rank].search(content_lower, pos)
+            if match is None:
+                break
+            best_rank = _LANGUAGE_PRIORITY[match.lastgroup]
+            pos = match.start() + 1
+        
+        # Languages ranked above bash win outright; JSON sits between sql and bash
+        bash_rank = _LANGUAGE_PRIORITY['bash']
+        if best_rank < bash_rank:
+            return _LANGUAGE_INDICATORS[best_rank][0]
         
         # JSON indicators
-        if content.strip().startswith('{') and content.strip().endswith('}'):
+        stripped = content.strip()
+        if stripped.startswith('{') and stripped.endswith('}'):
             return 'json'
         
         # Shell script indicators
-        if content.startswith('#!') or any(indicator in content_lower for indicator in ['echo ', 'cd ', 'ls ', 'grep ']):
+        if content.startswith('#!') or best_rank == bash_rank:
             return 'bash'
         
         return ''  # No language detected
     
     def get_template_options(self) -> Dict[str, Dict[str, Any]]:
         """Get available template options."""
-        return {
-            'default': {
-                'description': 'Standard conversation format',
-                'include_metadata': True,
-                'include_timestamps': True,
-                'use_code_blocks': True,
-                'add_table_of_contents': False
-            },
-            'clean': {
-                'description': 'Clean format without metadata',
-                'include_metadata': False,
-                'include_timestamps': False,
-                'use_code_blocks': True,
-                'add_table_of_contents': False
-            },
-            'detailed': {
-                'description': 'Detailed format with all metadata and TOC',
-                'include_metadata': True,
-                'include_timestamps': True,
-                'use_code_blocks': True,
-                'add_table_of_contents': True,
-                'include_message_numbers': True
-            },
-            'presentation': {
-                'description': 'Format suitable for presentations',
-                'include_metadata': False,
-                'include_timestamps': False,
-                'use_code_blocks': True,
-                'add_table_of_contents': True,
-                'message_separator': '\n\n---\n\n'
-            }
-        }
+        return {name: dict(template) for name, template in _MARKDOWN_TEMPLATES.items()}
     
     def apply_template(self, template_name: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Apply a predefined template to export options."""
-        templates = self.get_template_options()
-        if template_name not in templates:
+        template = _MARKDOWN_TEMPLATES.get(template_name)
+        if template is None:
             return options
         
-        template_options = templates[template_name].copy()
-        # Remove description as it's not an export option
-        template_options.pop('description', None)
-        
-        # Merge with provided options (provided options take precedence)
-        merged_options = template_options.copy()
+        # Description is not an export option; provided options take precedence
+        merged_options = {key: value for key, value in template.items() if key != 'description'}
         merged_options.update(options)
         
-        return merged_options
\ No newline at end of file
+        return merged_options
@@ -0,0 +1,190 @@
+"""
+MessagePack exporter for D-Model-Runner conversations.
+
+This module provides a compact binary alternative to the JSON exporter for
+large conversation archives. The exported structure mirrors the JSON export
+format, so files round-trip through the same import logic. Requires the
+optional msgpack package.
+"""
+
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from ..conversation import Conversation
+from ..exporters import BaseExporter
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+
+# Pending packed bytes are written out once they reach this size
+_FLUSH_SIZE = 256 * 1024
+
+# Default export options; read-only so callers copy rather than mutate
+_DEFAULT_MSGPACK_OPTIONS = MappingProxyType({
+    'include_metadata': True,
+    'include_timestamps': True,
+    'include_message_metadata': False,
+    'fsync': False
+})
+
+
+class MessagePackExporter(BaseExporter):
+    """Exporter for MessagePack format."""
+    
+    @property
+    def format_name(self) -> str:
+        return "MSGPACK"
+    
+    @property
+    def file_extension(self) -> str:
+        return "msgpack"
+    
+    @property
+    def mime_type(self) -> str:
+        return "application/x-msgpack"
+    
+    def validate_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate MessagePack export options."""
+        validated = dict(_DEFAULT_MSGPACK_OPTIONS)
+        if options:
+            validated.update(options)
+        return validated
+    
+    def export(self, conversation: Conversation, output_path: Path,
+               options: Optional[Dict[str, Any]] = None) -> Path:
+        """Export conversation to MessagePack format."""
+        self._require_msgpack()
+        validated_options = self.prepare_options(options)
+        packer = msgpack.Packer(use_bin_type=True)
+        
+        with open(output_path, 'wb') as f:
+            buf = bytearray(packer.pack_map_header(2))
+            buf += packer.pack('export_info')
+            buf += packer.pack(self._export_info(conversation.metadata.updated_at.isoformat()))
+            buf += packer.pack('conversation')
+            self._write_conversation(f, buf, packer, conversation, validated_options)
+            f.write(buf)
+            if validated_options['fsync']:
+                self._sync_file(f)
+        
+        return output_path
+    
+    def export_multiple_conversations(self, conversations: List[Conversation],
+                                    output_path: Path,
+                                    options: Optional[Dict[str, Any]] = None) -> Path:
+        """Export multiple conversations to a single MessagePack file."""
+        self._require_msgpack()
+        validated_options = self.prepare_options(options)
+        packer = msgpack.Packer(use_bin_type=True)
+        
+        export_info = self._export_info(
+            conversations[0].metadata.updated_at.isoformat() if conversations else ""
+        )
+        export_info['format'] = 'msgpack_collection'
+        export_info['conversation_count'] = len(conversations)
+        
+        with open(output_path, 'wb') as f:
+            buf = bytearray(packer.pack_map_header(2))
+            buf += packer.pack('export_info')
+            buf += packer.pack(export_info)
+            buf += packer.pack('conversations')
+            buf += packer.pack_array_header(len(conversations))
+            for conversation in conversations:
+                self._write_conversation(f, buf, packer, conversation, validated_options)
+            f.write(buf)
+            if validated_options['fsync']:
+                self._sync_file(f)
+        
+        return output_path
+    
+    def import_conversation(self, file_path: Path) -> Conversation:
+        """Import conversation from MessagePack file."""
+        data = self._load(file_path)
+        
+        if 'conversation' in data:
+            conversation_data = data['conversation']
+        elif 'id' in data and 'messages' in data:
+            conversation_data = data
+        else:
+            raise ValueError("Invalid MessagePack format for conversation import")
+        
+        return Conversation.from_dict(conversation_data)
+    
+    def import_multiple_conversations(self, file_path: Path) -> List[Conversation]:
+        """Import multiple conversations from MessagePack file."""
+        data = self._load(file_path)
+        
+        if 'conversations' not in data:
+            raise ValueError("Invalid MessagePack format for multiple conversation import")
+        
+        return Conversation.from_dict_many(data['conversations'])
+    
+    def _load(self, file_path: Path) -> Dict[str, Any]:
+        """Read and decode a MessagePack file."""
+        self._require_msgpack()
+        with open(file_path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    
+    def _export_info(self, exported_at: str) -> Dict[str, Any]:
+        """Build the export_info header."""
+        return {
+            'format': 'msgpack',
+            'version': '1.0',
+            'exported_at': exported_at,
+            'exporter': 'D-Model-Runner MessagePack Exporter'
+        }
+    
+    def _write_conversation(self, f: BinaryIO, buf: bytearray, packer: Any,
+                            conversation: Conversation, options: Dict[str, Any]) -> None:
+        """
+        Pack one conversation, matching the JSON export layout, into buf.
+        
+        Each message is packed as soon as its small record is built, so the
+        full conversation structure never exists in memory; buf is flushed to
+        f whenever it grows past the flush size.
+        
+        Args:
+            f: Output file
+            buf: Pending output bytes
+            packer: msgpack.Packer used for all objects
+            conversation: Conversation to pack
+            options: Validated export options
+        """
+        include_metadata = options['include_metadata']
+        include_timestamps = options['include_timestamps']
+        include_message_metadata = options['include_message_metadata']
+        pack = packer.pack
+        
+        buf += packer.pack_map_header(3 if include_metadata else 2)
+        buf += pack('id')
+        buf += pack(conversation.id)
+        if include_metadata:
+            buf += pack('metadata')
+            buf += pack(conversation.metadata.to_dict())
+        
+        buf += pack('messages')
+        buf += packer.pack_array_header(len(conversation.messages))
+        for message in conversation.messages:
+            message_data = {'role': message.role, 'content': message.content}
+            # msgpack has no naive-datetime type, so timestamps are formatted here
+            if include_timestamps:
+                message_data['timestamp'] = message.timestamp.isoformat()
+            if include_message_metadata and message.metadata:
+                message_data['metadata'] = message.metadata
+            buf += pack(message_data)
+            
+            if len(buf) >= _FLUSH_SIZE:
+                f.write(buf)
+                buf.clear()
+    
+    @staticmethod
+    def _require_msgpack() -> None:
+        """Raise a helpful error when msgpack is not installed."""
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("MessagePack export requires the 'msgpack' package: pip install msgpack")
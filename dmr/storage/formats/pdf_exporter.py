@@ -5,18 +5,294 @@ This module provides PDF export functionality with professional formatting
 and custom styling options. Uses reportlab for PDF generation.
 """
 
+import html
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 import io
 
 from ..conversation import Conversation
 from ..exporters import BaseExporter
+from ...utils.helpers import timestamp_formatter
+
+logger = logging.getLogger(__name__)
+
+try:
+    from reportlab.lib import colors  # type: ignore[import-untyped]
+    from reportlab.lib.pagesizes import letter, A4, A3, A5, legal  # type: ignore[import-untyped]
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  # type: ignore[import-untyped]
+    from reportlab.lib.units import inch  # type: ignore[import-untyped]
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, XPreformatted  # type: ignore[import-untyped]
+    REPORTLAB_AVAILABLE = True
+    
+    # ReportLab page sizes for the values accepted by validate_options
+    _PAGE_SIZES = {'A4': A4, 'A3': A3, 'A5': A5, 'Letter': letter, 'Legal': legal}
+except ImportError:
+    REPORTLAB_AVAILABLE = False
 
 # PDF generation will be implemented using reportlab or weasyprint
 # For now, we'll create a base implementation that can be extended
 
 
+# Default export options; read-only so callers copy rather than mutate
+_DEFAULT_PDF_OPTIONS = MappingProxyType({
+    'include_metadata': True,
+    'include_timestamps': True,
+    'page_size': 'A4',
+    'margin': '1in',
+    'font_family': 'Arial',
+    'font_size': 12,
+    'add_page_numbers': True,
+    'add_header': True,
+    'add_footer': True,
+    'custom_css': None,
+    'title_font_size': 18,
+    'header_font_size': 14,
+    'timestamp_format': '%Y-%m-%d %H:%M:%S',
+    'color_scheme': 'default',
+    'write_companion_html': False
+})
+
+# Page sizes accepted by validate_options
+_VALID_PAGE_SIZES = frozenset({'A4', 'A3', 'A5', 'Letter', 'Legal'})
+
+# Substrings (matched against lowercased content) that mark a message as code
+_CODE_INDICATORS = (
+    'def ', 'class ', 'import ', 'from ', 'function', 'var ', 'const ', 'let ',
+    '#!/', '<?', '<html', '<div', '{', '}', ';'
+)
+_CODE_INDICATOR_RE = re.compile('|'.join(map(re.escape, _CODE_INDICATORS)))
+
+# Narrower keyword set the ReportLab path uses to pick the code paragraph style.
+# Both patterns are matched against lowercased text: case-insensitive regexes
+# lose the literal-prefix scan and measured several times slower than the copy
+_CODE_KEYWORD_RE = re.compile(r'def |function|class |import ')
+
+# Rule closing each message in the plain text fallback
+_TEXT_MESSAGE_SUFFIX = "\n" + "-" * 30
+
+
+# Default stylesheet for the HTML-based engines; filled in by _render_css
+_CSS_TEMPLATE = """
+        @page {{
+            size: {page_size};
+            margin: {margin};
+        }}
+        
+        body {{
+            font-family: {font_family}, sans-serif;
+            font-size: {font_size}pt;
+            line-height: 1.6;
+            color: #333;
+        }}
+        
+        h1 {{
+            font-size: {title_font_size}pt;
+            color: #2c3e50;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 10px;
+        }}
+        
+        h2 {{
+            font-size: {header_font_size}pt;
+            color: #34495e;
+            margin-top: 30px;
+        }}
+        
+        h3 {{
+            font-size: {font_size_plus_2}pt;
+            color: #7f8c8d;
+            margin-bottom: 5px;
+        }}
+        
+        .metadata table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-bottom: 20px;
+        }}
+        
+        .metadata td {{
+            padding: 8px;
+            border: 1px solid #ddd;
+        }}
+        
+        .metadata td:first-child {{
+            background-color: #f8f9fa;
+            font-weight: bold;
+            width: 150px;
+        }}
+        
+        .message {{
+            margin-bottom: 25px;
+            padding: 15px;
+            border-left: 4px solid #3498db;
+            background-color: #f8f9fa;
+        }}
+        
+        .message-user {{
+            border-left-color: #e74c3c;
+        }}
+        
+        .message-assistant {{
+            border-left-color: #27ae60;
+        }}
+        
+        .message-system {{
+            border-left-color: #f39c12;
+        }}
+        
+        .timestamp {{
+            font-style: italic;
+            font-size: {font_size_minus_2}pt;
+            color: #7f8c8d;
+            margin-bottom: 10px;
+        }}
+        
+        .content {{
+            margin-top: 10px;
+            white-space: pre-wrap;
+        }}
+        
+        .code {{
+            background-color: #2c3e50;
+            color: #ecf0f1;
+            padding: 15px;
+            border-radius: 5px;
+            font-family: 'Courier New', monospace;
+            white-space: pre-wrap;
+            font-size: {font_size_minus_1}pt;
+            overflow-x: auto;
+        }}
+        """
+
+
+@lru_cache(maxsize=32)
+def _render_css(page_size: str, margin: str, font_family: str, font_size: int,
+                title_font_size: int, header_font_size: int) -> str:
+    """
+    Format the default stylesheet; repeated exports reuse the same options.
+    
+    Args:
+        page_size: CSS page size
+        margin: CSS page margin
+        font_family: Body font family
+        font_size: Body font size in points
+        title_font_size: Title font size in points
+        header_font_size: Section header font size in points
+        
+    Returns:
+        Formatted CSS
+    """
+    return _CSS_TEMPLATE.format(
+        page_size=page_size,
+        margin=margin,
+        font_family=font_family,
+        font_size=font_size,
+        title_font_size=title_font_size,
+        header_font_size=header_font_size,
+        font_size_plus_2=font_size + 2,
+        font_size_minus_1=font_size - 1,
+        font_size_minus_2=font_size - 2
+    )
+
+
+@lru_cache(maxsize=1)
+def _detect_engines() -> Tuple[str, ...]:
+    """
+    Probe the optional PDF libraries once per process.
+    
+    Failed imports are not cached by Python, so without this every exporter
+    instance would search the import path again for missing packages.
+    
+    Returns:
+        Available engine names in preference order, ending with 'html2pdf'
+    """
+    engines = []
+    
+    if REPORTLAB_AVAILABLE:
+        engines.append('reportlab')
+    
+    try:
+        import weasyprint  # type: ignore[import-untyped]
+        engines.append('weasyprint')
+    except ImportError:
+        pass
+    
+    engines.append('html2pdf')  # Always available as fallback
+    
+    return tuple(engines)
+
+
+@lru_cache(maxsize=16)
+def _make_styles(title_font_size: float, header_font_size: float,
+                 font_size: float) -> Tuple[Any, Any, Any, Any]:
+    """
+    Build the ReportLab paragraph styles for a combination of font sizes.
+    
+    Args:
+        title_font_size: Title font size in points
+        header_font_size: Section header font size in points
+        font_size: Body font size in points
+        
+    Returns:
+        Title, header, body and code paragraph styles
+    """
+    styles = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=title_font_size,
+        fontName='Helvetica-Bold',
+        spaceAfter=12
+    )
+    
+    header_style = ParagraphStyle(
+        'CustomHeader',
+        parent=styles['Heading2'],
+        fontSize=header_font_size,
+        fontName='Helvetica-Bold',
+        spaceAfter=6
+    )
+    
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=styles['Normal'],
+        fontSize=font_size,
+        fontName='Helvetica',
+        spaceAfter=6
+    )
+    
+    code_style = ParagraphStyle(
+        'CustomCode',
+        parent=styles['Code'],
+        fontSize=font_size - 1,
+        fontName='Courier',
+        leftIndent=20,
+        backColor=colors.lightgrey
+    )
+    
+    return title_style, header_style, body_style, code_style
+
+
+@dataclass(frozen=True)
+class _HeaderView:
+    """Conversation header fields formatted once and shared by all renderers."""
+    title: str
+    id: str
+    model: str
+    message_count: int
+    created: Optional[str] = None  # None when timestamps are excluded
+    updated: Optional[str] = None
+    tags: Optional[str] = None  # None when the conversation has no tags
+    description: Optional[str] = None  # None when empty
+
+
 class PDFExporter(BaseExporter):
     """Exporter for PDF format."""
     
@@ -38,42 +314,17 @@ class PDFExporter(BaseExporter):
     
     def _check_dependencies(self) -> None:
         """Check for PDF generation dependencies."""
-        try:
-            import reportlab  # type: ignore[import-untyped]
-            self._pdf_engine = 'reportlab'
-        except ImportError:
-            try:
-                import weasyprint  # type: ignore[import-untyped]
-                self._pdf_engine = 'weasyprint'
-            except ImportError:
-                self._pdf_engine = 'html2pdf'  # Fallback using built-in HTML generation
+        # Falls back to built-in HTML generation when no library is installed
+        self._pdf_engine = _detect_engines()[0]
     
     def validate_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
         """Validate PDF export options."""
-        default_options = {
-            'include_metadata': True,
-            'include_timestamps': True,
-            'page_size': 'A4',
-            'margin': '1in',
-            'font_family': 'Arial',
-            'font_size': 12,
-            'add_page_numbers': True,
-            'add_header': True,
-            'add_footer': True,
-            'custom_css': None,
-            'title_font_size': 18,
-            'header_font_size': 14,
-            'timestamp_format': '%Y-%m-%d %H:%M:%S',
-            'color_scheme': 'default'
-        }
-        
-        validated = default_options.copy()
+        validated = dict(_DEFAULT_PDF_OPTIONS)
         if options:
             validated.update(options)
         
         # Validate page size
-        valid_page_sizes = ['A4', 'A3', 'A5', 'Letter', 'Legal']
-        if validated['page_size'] not in valid_page_sizes:
+        if validated['page_size'] not in _VALID_PAGE_SIZES:
             validated['page_size'] = 'A4'
         
         # Validate font size
@@ -85,7 +336,7 @@ class PDFExporter(BaseExporter):
     def export(self, conversation: Conversation, output_path: Path, 
                options: Optional[Dict[str, Any]] = None) -> Path:
         """Export conversation to PDF format."""
-        validated_options = self.validate_options(options)
+        validated_options = self.prepare_options(options)
         
         if self._pdf_engine == 'reportlab':
             return self._export_with_reportlab(conversation, output_path, validated_options)
@@ -97,131 +348,90 @@ class PDFExporter(BaseExporter):
     def _export_with_reportlab(self, conversation: Conversation, output_path: Path, 
                               options: Dict[str, Any]) -> Path:
         """Export using ReportLab library."""
-        try:
-            from reportlab.lib.pagesizes import letter, A4, A3, A5, legal  # type: ignore[import-untyped]
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak  # type: ignore[import-untyped]
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  # type: ignore[import-untyped]
-            from reportlab.lib.units import inch  # type: ignore[import-untyped]
-            from reportlab.lib import colors  # type: ignore[import-untyped]
-            
-            # Map page sizes
-            page_size_map = {
-                'A4': A4, 'A3': A3, 'A5': A5, 'Letter': letter, 'Legal': legal
-            }
-            page_size = page_size_map.get(options['page_size'], A4)
-            
-            # Create document
-            doc = SimpleDocTemplate(
-                str(output_path),
-                pagesize=page_size,
-                topMargin=inch,
-                bottomMargin=inch,
-                leftMargin=inch,
-                rightMargin=inch
-            )
-            
-            # Get styles
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=options['title_font_size'],
-                fontName='Helvetica-Bold',
-                spaceAfter=12
-            )
+        if not REPORTLAB_AVAILABLE:
+            # Fallback to HTML2PDF if reportlab is not available
+            return self._export_with_html2pdf(conversation, output_path, options)
+        
+        page_size = _PAGE_SIZES.get(options['page_size'], A4)
+        
+        # Paragraph styles depend only on the font sizes, so they are cached
+        title_style, header_style, body_style, code_style = _make_styles(
+            options['title_font_size'], options['header_font_size'], options['font_size']
+        )
+        
+        # Build content
+        story = []
+        
+        # Title
+        view = self._prepare_header_view(conversation, options)
+        story.append(Paragraph(html.escape(view.title, quote=False), title_style))
+        story.append(Spacer(1, 12))
+        
+        # Metadata
+        if options['include_metadata']:
+            story.append(Paragraph("Conversation Metadata", header_style))
             
-            header_style = ParagraphStyle(
-                'CustomHeader',
-                parent=styles['Heading2'],
-                fontSize=options['header_font_size'],
-                fontName='Helvetica-Bold',
-                spaceAfter=6
-            )
+            metadata_text = f"""
+            <b>ID:</b> {html.escape(view.id, quote=False)}<br/>
+            <b>Model:</b> {html.escape(view.model, quote=False)}<br/>
+            <b>Messages:</b> {view.message_count}<br/>
+            """
             
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['Normal'],
-                fontSize=options['font_size'],
-                fontName='Helvetica',
-                spaceAfter=6
-            )
+            if view.created is not None:
+                metadata_text += f"""
+                <b>Created:</b> {view.created}<br/>
+                <b>Updated:</b> {view.updated}<br/>
+                """
             
-            code_style = ParagraphStyle(
-                'CustomCode',
-                parent=styles['Code'],
-                fontSize=options['font_size'] - 1,
-                fontName='Courier',
-                leftIndent=20,
-                backColor=colors.lightgrey
-            )
+            if view.tags is not None:
+                metadata_text += f"<b>Tags:</b> {html.escape(view.tags, quote=False)}<br/>"
             
-            # Build content
-            story = []
+            if view.description is not None:
+                metadata_text += f"<b>Description:</b> {html.escape(view.description, quote=False)}<br/>"
             
-            # Title
-            story.append(Paragraph(conversation.metadata.title, title_style))
+            story.append(Paragraph(metadata_text, body_style))
             story.append(Spacer(1, 12))
+        
+        # Messages
+        story.append(Paragraph("Conversation Messages", header_style))
+        
+        include_timestamps = options['include_timestamps']
+        format_timestamp = timestamp_formatter(options['timestamp_format'])
+        
+        for i, message in enumerate(conversation.messages, 1):
+            # Message header
+            role_header = f"Message {i}: {html.escape(message.role.title(), quote=False)}"
+            story.append(Paragraph(role_header, header_style))
             
-            # Metadata
-            if options['include_metadata']:
-                story.append(Paragraph("Conversation Metadata", header_style))
-                
-                metadata_text = f"""
-                <b>ID:</b> {conversation.id}<br/>
-                <b>Model:</b> {conversation.metadata.model}<br/>
-                <b>Messages:</b> {len(conversation.messages)}<br/>
-                """
-                
-                if options['include_timestamps']:
-                    created = conversation.metadata.created_at.strftime(options['timestamp_format'])
-                    updated = conversation.metadata.updated_at.strftime(options['timestamp_format'])
-                    metadata_text += f"""
-                    <b>Created:</b> {created}<br/>
-                    <b>Updated:</b> {updated}<br/>
-                    """
-                
-                if conversation.metadata.tags:
-                    tags = ", ".join(conversation.metadata.tags)
-                    metadata_text += f"<b>Tags:</b> {tags}<br/>"
-                
-                if conversation.metadata.description:
-                    metadata_text += f"<b>Description:</b> {conversation.metadata.description}<br/>"
-                
-                story.append(Paragraph(metadata_text, body_style))
-                story.append(Spacer(1, 12))
-            
-            # Messages
-            story.append(Paragraph("Conversation Messages", header_style))
+            # Timestamp
+            if include_timestamps:
+                timestamp = format_timestamp(message.timestamp)
+                story.append(Paragraph(f"<i>{timestamp}</i>", body_style))
             
-            for i, message in enumerate(conversation.messages, 1):
-                # Message header
-                role_header = f"Message {i}: {message.role.title()}"
-                story.append(Paragraph(role_header, header_style))
-                
-                # Timestamp
-                if options['include_timestamps']:
-                    timestamp = message.timestamp.strftime(options['timestamp_format'])
-                    story.append(Paragraph(f"<i>{timestamp}</i>", body_style))
-                
-                # Content
-                content = message.content.replace('\n', '<br/>')
-                # Simple code detection
-                if any(indicator in content.lower() for indicator in ['def ', 'function', 'class ', 'import ']):
-                    story.append(Paragraph(content, code_style))
-                else:
-                    story.append(Paragraph(content, body_style))
-                
-                story.append(Spacer(1, 12))
+            # Content
+            # Paragraphs parse their text as markup, so escape it first
+            content = html.escape(message.content, quote=False)
+            # Simple code detection; preformatted blocks keep line breaks as-is
+            if _CODE_KEYWORD_RE.search(message.content.lower()):
+                story.append(XPreformatted(content, code_style))
+            else:
+                story.append(Paragraph(content.replace('\n', '<br/>'), body_style))
             
-            # Build PDF
+            story.append(Spacer(1, 12))
+        
+        # Build PDF into our own large-buffered file; ReportLab writes the
+        # document in many small pieces
+        with open(output_path, 'wb', buffering=self._WRITE_BUFFER_SIZE) as f:
+            doc = SimpleDocTemplate(
+                f,
+                pagesize=page_size,
+                topMargin=inch,
+                bottomMargin=inch,
+                leftMargin=inch,
+                rightMargin=inch
+            )
             doc.build(story)
-            return output_path
-            
-        except ImportError:
-            # Fallback to HTML2PDF if reportlab is not available
-            return self._export_with_html2pdf(conversation, output_path, options)
+        return output_path
     
     def _export_with_weasyprint(self, conversation: Conversation, output_path: Path, 
                                options: Dict[str, Any]) -> Path:
@@ -234,7 +444,8 @@ class PDFExporter(BaseExporter):
             
             # Create PDF from HTML
             html_doc = weasyprint.HTML(string=html_content)
-            html_doc.write_pdf(str(output_path))
+            with open(output_path, 'wb', buffering=self._WRITE_BUFFER_SIZE) as f:
+                html_doc.write_pdf(target=f)
             
             return output_path
             
@@ -245,48 +456,74 @@ class PDFExporter(BaseExporter):
     def _export_with_html2pdf(self, conversation: Conversation, output_path: Path, 
                              options: Dict[str, Any]) -> Path:
         """Export using HTML generation and browser printing (fallback method)."""
-        # Generate HTML content
-        html_content = self._generate_html_content(conversation, options)
-        
-        # Save HTML file alongside PDF for manual conversion
-        html_path = output_path.with_suffix('.html')
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        # Create a simple text-based PDF alternative
-        text_content = self._generate_text_content(conversation, options)
-        
-        # Write text content as fallback
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("PDF Export (Text Format)\n")
-            f.write("=" * 50 + "\n\n")
-            f.write("Note: Install 'reportlab' or 'weasyprint' for proper PDF generation.\n")
-            f.write(f"HTML version saved as: {html_path}\n\n")
-            f.write(text_content)
-        
-        print(f"PDF dependencies not available. Created text file and HTML file at {html_path}")
-        print("Install 'reportlab' or 'weasyprint' for proper PDF generation:")
-        print("  pip install reportlab")
-        print("  pip install weasyprint")
+        view = self._prepare_header_view(conversation, options)
+        
+        # Optionally save an HTML file alongside for manual conversion; both
+        # files are streamed so the full documents are never built in memory
+        html_note = ""
+        if options['write_companion_html']:
+            html_path = output_path.with_suffix('.html')
+            with open(html_path, 'w', encoding='utf-8', buffering=self._WRITE_BUFFER_SIZE) as f:
+                f.writelines(self._iter_html_chunks(conversation, options, view))
+            html_note = f"HTML version saved as: {html_path}\n"
+        
+        # Write a simple text-based PDF alternative as fallback
+        preamble = (
+            "PDF Export (Text Format)\n"
+            + "=" * 50 + "\n\n"
+            + "Note: Install 'reportlab' or 'weasyprint' for proper PDF generation.\n"
+            + html_note + "\n"
+        )
+        with open(output_path, 'w', encoding='utf-8', buffering=self._WRITE_BUFFER_SIZE) as f:
+            f.write(preamble)
+            f.writelines(self._iter_text_chunks(conversation, options, view))
+        
+        logger.warning(
+            f"PDF dependencies not available; wrote text fallback to {output_path}. "
+            "Install 'reportlab' or 'weasyprint' for proper PDF generation."
+        )
         
         return output_path
     
     def _generate_html_content(self, conversation: Conversation, options: Dict[str, Any]) -> str:
         """Generate HTML content for PDF conversion."""
+        return "".join(self._iter_html_chunks(conversation, options))
+    
+    def _iter_html_chunks(self, conversation: Conversation, options: Dict[str, Any],
+                          view: Optional[_HeaderView] = None) -> Iterator[str]:
+        """
+        Generate the HTML document piece by piece.
+        
+        The document head is yielded first, then one chunk per message, so
+        callers writing to a file never hold the whole document in memory.
+        
+        Args:
+            conversation: Conversation to render
+            options: Validated export options
+            view: Preformatted header fields, computed here if not given
+            
+        Yields:
+            Consecutive pieces of the HTML document
+        """
+        if view is None:
+            view = self._prepare_header_view(conversation, options)
+        
         css = self._get_default_css(options)
         if options['custom_css']:
             css += "\n" + options['custom_css']
         
+        # User-provided strings are escaped once each before interpolation
+        title = html.escape(view.title, quote=False)
         html_parts = [
             "<!DOCTYPE html>",
             "<html>",
             "<head>",
             "<meta charset='utf-8'>",
-            f"<title>{conversation.metadata.title}</title>",
+            f"<title>{title}</title>",
             f"<style>{css}</style>",
             "</head>",
             "<body>",
-            f"<h1>{conversation.metadata.title}</h1>"
+            f"<h1>{title}</h1>"
         ]
         
         # Metadata
@@ -294,18 +531,16 @@ class PDFExporter(BaseExporter):
             html_parts.append("<div class='metadata'>")
             html_parts.append("<h2>Conversation Metadata</h2>")
             html_parts.append("<table>")
-            html_parts.append(f"<tr><td><strong>ID:</strong></td><td>{conversation.id}</td></tr>")
-            html_parts.append(f"<tr><td><strong>Model:</strong></td><td>{conversation.metadata.model}</td></tr>")
-            html_parts.append(f"<tr><td><strong>Messages:</strong></td><td>{len(conversation.messages)}</td></tr>")
+            html_parts.append(f"<tr><td><strong>ID:</strong></td><td>{html.escape(view.id, quote=False)}</td></tr>")
+            html_parts.append(f"<tr><td><strong>Model:</strong></td><td>{html.escape(view.model, quote=False)}</td></tr>")
+            html_parts.append(f"<tr><td><strong>Messages:</strong></td><td>{view.message_count}</td></tr>")
             
-            if options['include_timestamps']:
-                created = conversation.metadata.created_at.strftime(options['timestamp_format'])
-                updated = conversation.metadata.updated_at.strftime(options['timestamp_format'])
-                html_parts.append(f"<tr><td><strong>Created:</strong></td><td>{created}</td></tr>")
-                html_parts.append(f"<tr><td><strong>Updated:</strong></td><td>{updated}</td></tr>")
+            if view.created is not None:
+                html_parts.append(f"<tr><td><strong>Created:</strong></td><td>{view.created}</td></tr>")
+                html_parts.append(f"<tr><td><strong>Updated:</strong></td><td>{view.updated}</td></tr>")
             
-            if conversation.metadata.tags:
-                tags = ", ".join(conversation.metadata.tags)
+            if view.tags is not None:
+                tags = html.escape(view.tags, quote=False)
                 html_parts.append(f"<tr><td><strong>Tags:</strong></td><td>{tags}</td></tr>")
             
             html_parts.append("</table>")
@@ -314,192 +549,135 @@ class PDFExporter(BaseExporter):
         # Messages
         html_parts.append("<div class='messages'>")
         html_parts.append("<h2>Conversation Messages</h2>")
+        yield "\n".join(html_parts)
+        
+        include_timestamps = options['include_timestamps']
+        format_timestamp = timestamp_formatter(options['timestamp_format'])
+        is_code = self._is_code_content
         
         for i, message in enumerate(conversation.messages, 1):
-            html_parts.append(f"<div class='message message-{message.role}'>")
-            html_parts.append(f"<h3>Message {i}: {message.role.title()}</h3>")
-            
-            if options['include_timestamps']:
-                timestamp = message.timestamp.strftime(options['timestamp_format'])
-                html_parts.append(f"<p class='timestamp'>{timestamp}</p>")
+            timestamp = (
+                f"\n<p class='timestamp'>{format_timestamp(message.timestamp)}</p>"
+                if include_timestamps else ""
+            )
             
-            # Format content
-            content = message.content.replace('\n', '<br>')
-            if self._is_code_content(content):
-                html_parts.append(f"<pre class='code'>{content}</pre>")
-            else:
-                html_parts.append(f"<div class='content'>{content}</div>")
+            # Format content. Line breaks are kept by the pre-wrap stylesheet
+            # rule; only markup characters need escaping. Code detection looks
+            # at the raw text, since indicators such as '<div' or ';' would
+            # otherwise miss or spuriously hit the escaped entities
+            code = is_code(message.content)
             
-            html_parts.append("</div>")
-        
-        html_parts.append("</div>")
-        html_parts.append("</body>")
-        html_parts.append("</html>")
+            # The content is yielded on its own rather than interpolated, so
+            # the (possibly large) text is not copied again into each wrapper
+            yield (
+                f"\n<div class='message message-{html.escape(message.role)}'>\n"
+                f"<h3>Message {i}: {html.escape(message.role.title(), quote=False)}</h3>{timestamp}\n"
+                + ("<pre class='code'>" if code else "<div class='content'>")
+            )
+            yield html.escape(message.content, quote=False)
+            yield "</pre>\n</div>" if code else "</div>\n</div>"
         
-        return "\n".join(html_parts)
+        yield "\n</div>\n</body>\n</html>"
     
     def _generate_text_content(self, conversation: Conversation, options: Dict[str, Any]) -> str:
         """Generate plain text content."""
+        return "".join(self._iter_text_chunks(conversation, options))
+    
+    def _iter_text_chunks(self, conversation: Conversation, options: Dict[str, Any],
+                          view: Optional[_HeaderView] = None) -> Iterator[str]:
+        """
+        Generate the plain text document piece by piece.
+        
+        Args:
+            conversation: Conversation to render
+            options: Validated export options
+            view: Preformatted header fields, computed here if not given
+            
+        Yields:
+            Consecutive pieces of the text document
+        """
+        if view is None:
+            view = self._prepare_header_view(conversation, options)
+        
         lines = []
         
-        lines.append(f"Title: {conversation.metadata.title}")
+        lines.append(f"Title: {view.title}")
         lines.append("")
         
         if options['include_metadata']:
             lines.append("Metadata:")
-            lines.append(f"  ID: {conversation.id}")
-            lines.append(f"  Model: {conversation.metadata.model}")
-            lines.append(f"  Messages: {len(conversation.messages)}")
+            lines.append(f"  ID: {view.id}")
+            lines.append(f"  Model: {view.model}")
+            lines.append(f"  Messages: {view.message_count}")
             
-            if options['include_timestamps']:
-                created = conversation.metadata.created_at.strftime(options['timestamp_format'])
-                updated = conversation.metadata.updated_at.strftime(options['timestamp_format'])
-                lines.append(f"  Created: {created}")
-                lines.append(f"  Updated: {updated}")
+            if view.created is not None:
+                lines.append(f"  Created: {view.created}")
+                lines.append(f"  Updated: {view.updated}")
             
-            if conversation.metadata.tags:
-                lines.append(f"  Tags: {', '.join(conversation.metadata.tags)}")
+            if view.tags is not None:
+                lines.append(f"  Tags: {view.tags}")
             
             lines.append("")
         
         lines.append("Messages:")
         lines.append("-" * 50)
+        yield "\n".join(lines)
+        
+        include_timestamps = options['include_timestamps']
+        format_timestamp = timestamp_formatter(options['timestamp_format'])
         
         for i, message in enumerate(conversation.messages, 1):
-            lines.append(f"\nMessage {i}: {message.role.title()}")
-            
-            if options['include_timestamps']:
-                timestamp = message.timestamp.strftime(options['timestamp_format'])
-                lines.append(f"Time: {timestamp}")
+            if include_timestamps:
+                timestamp = format_timestamp(message.timestamp)
+                yield f"\n\nMessage {i}: {message.role.title()}\nTime: {timestamp}\n\n"
+            else:
+                yield f"\n\nMessage {i}: {message.role.title()}\n\n"
             
-            lines.append("")
-            lines.append(message.content)
-            lines.append("-" * 30)
+            # Yielded as-is so the message text is never copied into a wrapper
+            yield message.content
+            yield _TEXT_MESSAGE_SUFFIX
+    
+    def _prepare_header_view(self, conversation: Conversation,
+                             options: Dict[str, Any]) -> _HeaderView:
+        """
+        Format the conversation header fields the chosen options need.
         
-        return "\n".join(lines)
+        Args:
+            conversation: Conversation being exported
+            options: Validated export options
+            
+        Returns:
+            Header fields shared by the HTML, text and ReportLab renderers
+        """
+        metadata = conversation.metadata
+        created = updated = None
+        if options['include_timestamps']:
+            created = metadata.created_at.strftime(options['timestamp_format'])
+            updated = metadata.updated_at.strftime(options['timestamp_format'])
+        
+        return _HeaderView(
+            title=metadata.title,
+            id=conversation.id,
+            model=metadata.model,
+            message_count=len(conversation.messages),
+            created=created,
+            updated=updated,
+            tags=", ".join(metadata.tags) if metadata.tags else None,
+            description=metadata.description or None
+        )
     
     def _get_default_css(self, options: Dict[str, Any]) -> str:
         """Get default CSS for HTML to PDF conversion."""
-        return f"""
-        @page {{
-            size: {options['page_size']};
-            margin: {options['margin']};
-        }}
-        
-        body {{
-            font-family: {options['font_family']}, sans-serif;
-            font-size: {options['font_size']}pt;
-            line-height: 1.6;
-            color: #333;
-        }}
-        
-        h1 {{
-            font-size: {options['title_font_size']}pt;
-            color: #2c3e50;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        
-        h2 {{
-            font-size: {options['header_font_size']}pt;
-            color: #34495e;
-            margin-top: 30px;
-        }}
-        
-        h3 {{
-            font-size: {options['font_size'] + 2}pt;
-            color: #7f8c8d;
-            margin-bottom: 5px;
-        }}
-        
-        .metadata table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-bottom: 20px;
-        }}
-        
-        .metadata td {{
-            padding: 8px;
-            border: 1px solid #ddd;
-        }}
-        
-        .metadata td:first-child {{
-            background-color: #f8f9fa;
-            font-weight: bold;
-            width: 150px;
-        }}
-        
-        .message {{
-            margin-bottom: 25px;
-            padding: 15px;
-            border-left: 4px solid #3498db;
-            background-color: #f8f9fa;
-        }}
-        
-        .message-user {{
-            border-left-color: #e74c3c;
-        }}
-        
-        .message-assistant {{
-            border-left-color: #27ae60;
-        }}
-        
-        .message-system {{
-            border-left-color: #f39c12;
-        }}
-        
-        .timestamp {{
-            font-style: italic;
-            font-size: {options['font_size'] - 2}pt;
-            color: #7f8c8d;
-            margin-bottom: 10px;
-        }}
-        
-        .content {{
-            margin-top: 10px;
-        }}
-        
-        .code {{
-            background-color: #2c3e50;
-            color: #ecf0f1;
-            padding: 15px;
-            border-radius: 5px;
-            font-family: 'Courier New', monospace;
-            font-size: {options['font_size'] - 1}pt;
-            overflow-x: auto;
-        }}
-        """
+        return _render_css(
+            options['page_size'], options['margin'], options['font_family'],
+            options['font_size'], options['title_font_size'], options['header_font_size']
+        )
     
     def _is_code_content(self, content: str) -> bool:
         """Heuristically detect if content is code."""
-        code_indicators = [
-            'def ', 'class ', 'import ', 'from ', 'function', 'var ', 'const ', 'let ',
-            '#!/', '<?', '<html', '<div', '{', '}', ';'
-        ]
-        
-        content_lower = content.lower()
-        for indicator in code_indicators:
-            if indicator in content_lower:
-                return True
-        
-        return False
+        # One pass over the text for all indicators instead of one scan each
+        return _CODE_INDICATOR_RE.search(content.lower()) is not None
     
     def get_available_engines(self) -> List[str]:
         """Get list of available PDF generation engines."""
-        engines = []
-        
-        try:
-            import reportlab  # type: ignore[import-untyped]
-            engines.append('reportlab')
-        except ImportError:
-            pass
-        
-        try:
-            import weasyprint  # type: ignore[import-untyped]
-            engines.append('weasyprint')
-        except ImportError:
-            pass
-        
-        engines.append('html2pdf')  # Always available as fallback
-        
-        return engines
\ No newline at end of file
+        return list(_detect_engines())
\ No newline at end of file
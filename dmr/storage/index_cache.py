@@ -5,15 +5,155 @@ This module provides in-memory caching of conversation metadata to dramatically
 improve search performance and reduce file I/O operations.
 """
 
+import atexit
+import bisect
+import heapq
 import json
+import os
+import re
 import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from threading import Lock
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Any, Set, Tuple
+from threading import Lock, Timer
 import logging
 
+from ..utils.locks import ReadWriteLock
+from ..utils.serialization import dumps_json, loads_json
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+try:
+    import ijson  # type: ignore[import-untyped]
+    IJSON_AVAILABLE = True
+    _IJSON_ERRORS: Tuple[type, ...] = (ijson.JSONError,)
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+    _IJSON_ERRORS = ()
+
 logger = logging.getLogger(__name__)
 
+_INDEX_FILE_NAME = '.conversation_index.json'
+
+# Delay before pending index changes are written, coalescing bursts of updates
+_FLUSH_DELAY = 0.5
+
+# Conversation files at least this large are scanned with ijson instead of
+# being fully decoded; below it parser setup costs more than it saves
+_STREAM_THRESHOLD = 64 * 1024
+
+# Metadata extraction is disk-bound, so allow more threads than cores
+_MAX_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Index file format 2.0 stores metadata as parallel columns rather than one
+# object per conversation: (column name, metadata key, default when missing)
+_CACHE_VERSION = '2.0'
+_METADATA_COLUMNS = (
+    ('ids', 'id', None),
+    ('titles', 'title', ''),
+    ('models', 'model', ''),
+    ('created_at', 'created_at', ''),
+    ('updated_at', 'updated_at', ''),
+    ('tags', 'tags', []),
+    ('descriptions', 'description', ''),
+    ('message_counts', 'message_count', 0)
+)
+
+# Conversations whose lowercased message text is kept for repeated content searches
+_CONTENT_CACHE_SIZE = 32
+
+
+# Caches with a possibly pending flush, held weakly so registering for the
+# exit flush does not keep a cache alive
+_open_caches: 'weakref.WeakSet[ConversationIndexCache]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches() -> None:
+    """Persist changes still waiting for the debounced flush at exit."""
+    for cache in list(_open_caches):
+        cache._flush_if_dirty()
+
+
+# Lowercased (title, description, tags) of a conversation
+_SearchFields = Tuple[str, str, Tuple[str, ...]]
+
+
+def _search_fields(metadata: Dict[str, Any]) -> _SearchFields:
+    """Lowercase the searchable metadata fields once, for reuse by every query."""
+    return (
+        metadata['title'].lower(),
+        metadata.get('description', '').lower(),
+        tuple(tag.lower() for tag in metadata['tags'])
+    )
+
+
+def _metadata_tokens(fields: _SearchFields) -> Set[str]:
+    """Word tokens of the lowercased searchable metadata fields."""
+    title_lc, desc_lc, tags_lc = fields
+    # Newlines keep words of adjacent fields from running together
+    return set(_TOKEN_RE.findall('\n'.join([title_lc, desc_lc, *tags_lc])))
+
+
+@lru_cache(maxsize=_CONTENT_CACHE_SIZE)
+def _lowercased_contents(file_path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Load a conversation's lowercased message contents.
+    
+    The fingerprint arguments are only part of the cache key, so an edited
+    file is read again instead of serving stale text.
+    
+    Args:
+        file_path: Path to the conversation JSON file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+        
+    Returns:
+        Lowercased content of each message, in order
+    """
+    with open(file_path, 'rb') as f:
+        data = loads_json(f.read())
+    return tuple(message.get('content', '').lower() for message in data.get('messages', []))
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    """Forward file system events for conversation files to the cache."""
+    
+    def __init__(self, cache: 'ConversationIndexCache'):
+        super().__init__()
+        self._cache = cache
+    
+    def on_created(self, event) -> None:
+        if not event.is_directory:
+            self._cache._apply_file_change(event.src_path)
+    
+    def on_modified(self, event) -> None:
+        if not event.is_directory:
+            self._cache._apply_file_change(event.src_path)
+    
+    def on_deleted(self, event) -> None:
+        if not event.is_directory:
+            self._cache._apply_file_removal(event.src_path)
+    
+    def on_moved(self, event) -> None:
+        if not event.is_directory:
+            self._cache._apply_file_removal(event.src_path)
+            self._cache._apply_file_change(event.dest_path)
+
 
 class ConversationIndexCache:
     """
@@ -32,16 +172,125 @@ class ConversationIndexCache:
         """
         self.storage_dir = storage_dir
         self._metadata_cache: Dict[str, Dict[str, Any]] = {}
-        self._file_mtimes: Dict[str, float] = {}
-        self._cache_file = storage_dir / '.conversation_index.json'
-        self._lock = Lock()
+        # (st_mtime_ns, st_size) per conversation file; size catches edits
+        # on filesystems that preserve or coarsen mtimes
+        self._file_fp: Dict[str, Tuple[int, int]] = {}
+        # Word token -> IDs of conversations whose title, description or tags contain it
+        self._token_index: Dict[str, Set[str]] = defaultdict(set)
+        self._search_fields: Dict[str, _SearchFields] = {}
+        # Read-only views of the cached metadata handed out by listings and searches
+        self._metadata_views: Dict[str, Mapping[str, Any]] = {}
+        # (updated_at, conv_id) in ascending order, kept sorted on every change
+        self._updated_order: List[Tuple[str, str]] = []
+        self._cache_file = storage_dir / _INDEX_FILE_NAME
+        # Searches share the lock; rebuilds and updates take it exclusively
+        self._lock = ReadWriteLock()
+        # Serializes index file writes, which happen outside the cache lock
+        self._flush_lock = Lock()
         self._last_scan_time = 0
+        self._observer = None
+        self._dirty = False
+        self._flush_timer: Optional[Timer] = None
         
         # Ensure storage directory exists
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
         # Load existing cache or build new one
         self._load_or_build_cache()
+        
+        # Keep the cache current from change notifications instead of polling
+        self._start_watching()
+    
+    def _start_watching(self) -> None:
+        """Start a watchdog observer on the storage directory when available."""
+        if not WATCHDOG_AVAILABLE:
+            return
+        
+        try:
+            observer = Observer()
+            observer.schedule(_IndexEventHandler(self), str(self.storage_dir), recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            logger.warning(f"Failed to watch {self.storage_dir}, falling back to polling: {e}")
+            return
+        
+        self._observer = observer
+        logger.debug(f"Watching {self.storage_dir} for conversation changes")
+    
+    def stop_watching(self) -> None:
+        """Stop the file system observer; later lookups fall back to polling."""
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join()
+    
+    def close(self) -> None:
+        """
+        Stop watching, write any pending changes and drop the exit hook.
+        
+        The cache stays usable afterwards, falling back to polling; a later
+        change schedules its flush and re-registers the exit hook as usual.
+        """
+        self.stop_watching()
+        with self._lock.write_lock():
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._flush_if_dirty()
+        _open_caches.discard(self)
+    
+    def _event_conv_id(self, path: Any) -> Optional[str]:
+        """Map an event path to a conversation ID, or None for other files."""
+        name = os.path.basename(os.fsdecode(path))
+        if not name.endswith('.json') or name == _INDEX_FILE_NAME:
+            return None
+        return name[:-5]
+    
+    def _apply_file_change(self, path: Any) -> None:
+        """
+        Refresh the cache entry for a single created or modified file.
+        
+        Args:
+            path: Path reported by the file system event
+        """
+        conv_id = self._event_conv_id(path)
+        if conv_id is None:
+            return
+        
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        fp = (st.st_mtime_ns, st.st_size)
+        
+        # Saves through update_conversation_metadata already recorded this version
+        if self._file_fp.get(conv_id) == fp:
+            return
+        
+        metadata = self._extract_metadata_from_file(Path(os.fsdecode(path)))
+        if not metadata:
+            return
+        
+        with self._lock.write_lock():
+            self._store_metadata(conv_id, metadata)
+            self._file_fp[conv_id] = fp
+            self._mark_dirty()
+        
+        logger.debug(f"Refreshed cached metadata for conversation {conv_id}")
+    
+    def _apply_file_removal(self, path: Any) -> None:
+        """
+        Drop the cache entry for a deleted or renamed file.
+        
+        Args:
+            path: Path reported by the file system event
+        """
+        conv_id = self._event_conv_id(path)
+        if conv_id is None or conv_id not in self._file_fp:
+            return
+        
+        self.remove_conversation(conv_id)
     
     def _load_or_build_cache(self) -> None:
         """Load existing cache file or build new cache by scanning directory."""
@@ -59,11 +308,27 @@ class ConversationIndexCache:
     def _load_cache_file(self) -> None:
         """Load cache from the index file."""
         try:
-            with open(self._cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = loads_json(self._cache_file.read_bytes())
             
-            self._metadata_cache = cache_data.get('metadata', {})
-            self._file_mtimes = cache_data.get('mtimes', {})
+            # Search fields and tokens are rebuilt rather than persisted; they
+            # are cheap to derive from the metadata
+            self._metadata_cache = {}
+            self._search_fields.clear()
+            self._metadata_views.clear()
+            self._updated_order.clear()
+            self._token_index.clear()
+            if cache_data.get('version') == _CACHE_VERSION:
+                self._load_columns(cache_data)
+            else:
+                # Version 1.0 files hold one metadata object per conversation
+                for conv_id, metadata in cache_data.get('metadata', {}).items():
+                    self._store_metadata(conv_id, metadata)
+                # Caches written before fingerprints existed have none, so every
+                # file looks new and the cache is rebuilt once
+                self._file_fp = {
+                    conv_id: tuple(fp)
+                    for conv_id, fp in cache_data.get('fingerprints', {}).items()
+                }
             self._last_scan_time = cache_data.get('last_scan_time', 0)
             
             # Verify cache is still valid
@@ -77,59 +342,227 @@ class ConversationIndexCache:
             logger.warning(f"Cache file corrupted, rebuilding: {e}")
             self._build_cache_from_files()
     
+    def _load_columns(self, cache_data: Dict[str, Any]) -> None:
+        """
+        Populate the cache from a columnar (version 2.0) index file.
+        
+        Args:
+            cache_data: Decoded index file
+        """
+        keys = [key for _, key, _ in _METADATA_COLUMNS]
+        columns = [cache_data[column] for column, _, _ in _METADATA_COLUMNS]
+        for values in zip(*columns):
+            metadata = dict(zip(keys, values))
+            self._store_metadata(metadata['id'], metadata)
+        
+        self._file_fp = {
+            conv_id: (mtime_ns, size)
+            for conv_id, mtime_ns, size in zip(cache_data['ids'], cache_data['mtime_ns'], cache_data['sizes'])
+            if mtime_ns is not None
+        }
+    
+    def _encode_columns(self) -> Dict[str, Any]:
+        """
+        Lay out the cached metadata and fingerprints as index file columns.
+        
+        Returns:
+            Dictionary of equal-length column lists, one entry per conversation
+        """
+        conv_ids = list(self._metadata_cache)
+        entries = [self._metadata_cache[conv_id] for conv_id in conv_ids]
+        data: Dict[str, Any] = {
+            column: [entry.get(key, default) for entry in entries]
+            for column, key, default in _METADATA_COLUMNS
+        }
+        # The cache key is authoritative even if a stored entry's 'id' differs
+        data['ids'] = conv_ids
+        
+        fingerprints = [self._file_fp.get(conv_id) for conv_id in conv_ids]
+        data['mtime_ns'] = [fp[0] if fp else None for fp in fingerprints]
+        data['sizes'] = [fp[1] if fp else None for fp in fingerprints]
+        return data
+    
     def _is_cache_stale(self) -> bool:
-        """Check if cache needs to be refreshed by comparing file modification times."""
-        for conv_id, cached_mtime in self._file_mtimes.items():
-            file_path = self.storage_dir / f"{conv_id}.json"
-            if file_path.exists():
-                current_mtime = file_path.stat().st_mtime
-                if current_mtime > cached_mtime:
-                    return True
-            else:
-                # File was deleted
-                return True
+        """
+        Check if cache needs to be refreshed by comparing file fingerprints.
         
-        # Check for new files
-        for file_path in self.storage_dir.glob("*.json"):
-            if file_path.name == '.conversation_index.json':
-                continue
-            conv_id = file_path.stem
-            if conv_id not in self._file_mtimes:
-                return True
+        A single directory scan detects changed, new and deleted files.
+        """
+        seen = set()
+        with self._lock.read_lock():
+            for entry, conv_id in self._scan_conversation_files():
+                cached_fp = self._file_fp.get(conv_id)
+                if cached_fp is None:
+                    # New file
+                    return True
+                st = entry.stat()
+                if (st.st_mtime_ns, st.st_size) != cached_fp:
+                    return True
+                seen.add(conv_id)
+            
+            # Any cached id not seen was deleted
+            return len(seen) != len(self._file_fp)
+    
+    def _scan_conversation_files(self) -> Iterator[Tuple[os.DirEntry, str]]:
+        """
+        Iterate over conversation files in the storage directory.
         
-        return False
+        Yields:
+            Tuples of (os.DirEntry, conversation ID), skipping the index file
+        """
+        with os.scandir(self.storage_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.json') and name != _INDEX_FILE_NAME and entry.is_file():
+                    yield entry, name[:-5]
     
     def _build_cache_from_files(self) -> None:
         """Build cache by scanning all conversation files in the directory."""
         logger.debug(f"Scanning directory {self.storage_dir} for conversations")
         
-        with self._lock:
+        # Read files concurrently outside the lock so their I/O overlaps and
+        # searches keep running; only the final swap-in is exclusive
+        entries = list(self._scan_conversation_files())
+        if len(entries) > 1:
+            with ThreadPoolExecutor(max_workers=min(_MAX_SCAN_WORKERS, len(entries))) as executor:
+                scanned = list(executor.map(self._read_conversation_entry, entries))
+        else:
+            scanned = [self._read_conversation_entry(item) for item in entries]
+        
+        with self._lock.write_lock():
             self._metadata_cache.clear()
-            self._file_mtimes.clear()
-            
-            conversation_files = list(self.storage_dir.glob("*.json"))
+            self._file_fp.clear()
+            self._token_index.clear()
+            self._search_fields.clear()
+            self._metadata_views.clear()
+            self._updated_order.clear()
             
-            for file_path in conversation_files:
-                # Skip the index cache file itself
-                if file_path.name == '.conversation_index.json':
-                    continue
-                
-                try:
-                    conv_id = file_path.stem
-                    metadata = self._extract_metadata_from_file(file_path)
-                    if metadata:
-                        self._metadata_cache[conv_id] = metadata
-                        self._file_mtimes[conv_id] = file_path.stat().st_mtime
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to process {file_path}: {e}")
-                    continue
+            for result in scanned:
+                if result is not None:
+                    conv_id, metadata, fp = result
+                    self._store_metadata(conv_id, metadata)
+                    self._file_fp[conv_id] = fp
             
             self._last_scan_time = time.time()
+            self._dirty = True
             logger.debug(f"Built cache with {len(self._metadata_cache)} conversations")
+        
+        # Save cache to disk
+        self._flush_if_dirty()
+    
+    def _read_conversation_entry(
+        self, item: Tuple[os.DirEntry, str]
+    ) -> Optional[Tuple[str, Dict[str, Any], Tuple[int, int]]]:
+        """
+        Fingerprint a conversation file and extract its metadata.
+        
+        Args:
+            item: (directory entry, conversation ID) from _scan_conversation_files
             
-            # Save cache to disk
-            self._save_cache_file()
+        Returns:
+            Tuple of (conversation ID, metadata, fingerprint) or None if unreadable
+        """
+        entry, conv_id = item
+        file_path = Path(entry.path)
+        try:
+            # Fingerprint first so an edit made while reading shows up as stale
+            st = entry.stat()
+            metadata = self._extract_metadata_from_file(file_path)
+            if metadata:
+                return conv_id, metadata, (st.st_mtime_ns, st.st_size)
+        except Exception as e:
+            logger.warning(f"Failed to process {file_path}: {e}")
+        return None
+    
+    def _store_metadata(self, conv_id: str, metadata: Dict[str, Any]) -> None:
+        """
+        Cache metadata for a conversation with its search fields and postings.
+        
+        Must be called with the write lock held, or before the cache is shared.
+        
+        Args:
+            conv_id: Conversation ID
+            metadata: Conversation metadata dictionary
+        """
+        old_metadata = self._metadata_cache.get(conv_id)
+        if old_metadata is not None:
+            self._remove_from_order(conv_id, old_metadata)
+        bisect.insort(self._updated_order, (metadata['updated_at'], conv_id))
+        
+        old_fields = self._search_fields.get(conv_id)
+        old_tokens = _metadata_tokens(old_fields) if old_fields else set()
+        fields = _search_fields(metadata)
+        new_tokens = _metadata_tokens(fields)
+        
+        self._metadata_cache[conv_id] = metadata
+        self._search_fields[conv_id] = fields
+        self._metadata_views[conv_id] = MappingProxyType(metadata)
+        self._unindex_tokens(conv_id, old_tokens - new_tokens)
+        self._index_tokens(conv_id, new_tokens - old_tokens)
+    
+    def _discard_metadata(self, conv_id: str) -> None:
+        """Remove a conversation's metadata and token postings; write lock held."""
+        old_metadata = self._metadata_cache.pop(conv_id, None)
+        if old_metadata is not None:
+            self._remove_from_order(conv_id, old_metadata)
+        self._metadata_views.pop(conv_id, None)
+        old_fields = self._search_fields.pop(conv_id, None)
+        if old_fields:
+            self._unindex_tokens(conv_id, _metadata_tokens(old_fields))
+    
+    def _remove_from_order(self, conv_id: str, metadata: Dict[str, Any]) -> None:
+        """Drop a conversation's entry from the updated_at ordering."""
+        key = (metadata['updated_at'], conv_id)
+        index = bisect.bisect_left(self._updated_order, key)
+        if index < len(self._updated_order) and self._updated_order[index] == key:
+            del self._updated_order[index]
+            return
+        
+        # The caller changed updated_at in place after storing the dict
+        for index, (_, ordered_id) in enumerate(self._updated_order):
+            if ordered_id == conv_id:
+                del self._updated_order[index]
+                return
+    
+    def _index_tokens(self, conv_id: str, tokens: Iterable[str]) -> None:
+        """Add conv_id to the postings of each token."""
+        for token in tokens:
+            self._token_index[token].add(conv_id)
+    
+    def _unindex_tokens(self, conv_id: str, tokens: Iterable[str]) -> None:
+        """Remove conv_id from the postings of each token, dropping empty ones."""
+        for token in tokens:
+            postings = self._token_index.get(token)
+            if postings is not None:
+                postings.discard(conv_id)
+                if not postings:
+                    del self._token_index[token]
+    
+    def _candidate_ids(self, query_tokens: List[str]) -> Set[str]:
+        """
+        Find conversations that may contain the query in their metadata.
+        
+        A query that occurs inside a field has each of its word tokens inside
+        one of that field's tokens, so the result is a superset of the true
+        matches. Partial words are handled by matching against the token
+        vocabulary rather than requiring exact token hits.
+        
+        Args:
+            query_tokens: Word tokens of the lowercased query
+            
+        Returns:
+            Set of candidate conversation IDs
+        """
+        candidates: Optional[Set[str]] = None
+        for query_token in set(query_tokens):
+            matches: Set[str] = set()
+            for token, postings in self._token_index.items():
+                if query_token in token:
+                    matches |= postings
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                break
+        return candidates or set()
     
     def _extract_metadata_from_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """
@@ -142,8 +575,12 @@ class ConversationIndexCache:
             Dictionary containing conversation metadata or None if invalid
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if IJSON_AVAILABLE and os.path.getsize(file_path) >= _STREAM_THRESHOLD:
+                data, message_count = self._stream_metadata_from_file(file_path)
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                message_count = len(data.get('messages', []))
             
             # Extract only the metadata we need for search/listing
             metadata = {
@@ -154,83 +591,221 @@ class ConversationIndexCache:
                 'updated_at': data['metadata']['updated_at'],
                 'tags': data['metadata'].get('tags', []),
                 'description': data['metadata'].get('description', ''),
-                'message_count': len(data.get('messages', []))
+                'message_count': message_count
             }
             
             return metadata
             
-        except (json.JSONDecodeError, KeyError, OSError) as e:
+        except (json.JSONDecodeError, KeyError, AttributeError, TypeError, OSError, *_IJSON_ERRORS) as e:
+            # Malformed files, e.g. with non-object metadata, are skipped
             logger.warning(f"Failed to extract metadata from {file_path}: {e}")
             return None
     
-    def _save_cache_file(self) -> None:
-        """Save current cache state to disk."""
-        try:
-            cache_data = {
-                'metadata': self._metadata_cache,
-                'mtimes': self._file_mtimes,
-                'last_scan_time': self._last_scan_time,
-                'version': '1.0'
-            }
+    def _stream_metadata_from_file(self, file_path: Path) -> Tuple[Dict[str, Any], int]:
+        """
+        Read a conversation's id and metadata in one ijson pass, counting messages.
+        
+        Message bodies are tokenized but never built into Python objects.
+        
+        Args:
+            file_path: Path to the conversation JSON file
             
-            with open(self._cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-                
-            logger.debug(f"Saved cache with {len(self._metadata_cache)} conversations")
+        Returns:
+            Tuple of (dictionary with 'id' and 'metadata' keys, message count)
+        """
+        data: Dict[str, Any] = {}
+        message_count = 0
+        builder = None
+        
+        with open(file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == 'messages.item':
+                    # One start (or scalar) event per item; keys of message
+                    # objects and closing events share the prefix
+                    if event not in ('map_key', 'end_map', 'end_array'):
+                        message_count += 1
+                elif prefix == 'metadata':
+                    # Metadata that is not an object is left out, so the
+                    # caller rejects the file as malformed
+                    if event == 'start_map':
+                        builder = ijson.ObjectBuilder()
+                    if builder is not None:
+                        builder.event(event, value)
+                        if event == 'end_map':
+                            data['metadata'] = builder.value
+                            builder = None
+                elif prefix.startswith('metadata.') and builder is not None:
+                    builder.event(event, value)
+                elif prefix == 'id':
+                    data['id'] = value
+        
+        return data, message_count
+    
+    def _mark_dirty(self) -> None:
+        """
+        Record that the index file is out of date and schedule a flush.
+        
+        Must be called with the write lock held. Updates arriving before the
+        timer fires share a single write.
+        """
+        self._dirty = True
+        # Also covers changes still waiting for the debounced flush at exit
+        _open_caches.add(self)
+        if self._flush_timer is None:
+            self._flush_timer = Timer(_FLUSH_DELAY, self._flush_if_dirty)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _flush_if_dirty(self) -> None:
+        """
+        Write the index file if there are unsaved changes.
+        
+        Only encoding the snapshot holds the cache lock, and only on the
+        shared side; the disk write and fsync run without it, so searches
+        and updates are not stalled behind the disk.
+        """
+        with self._flush_lock:
+            with self._lock.read_lock():
+                # No writer can run while the read lock is held
+                self._flush_timer = None
+                if not self._dirty:
+                    return
+                if not self.storage_dir.is_dir():
+                    # Storage was removed; there is nowhere left to persist to
+                    self._dirty = False
+                    return
+                cache_data = self._encode_columns()
+                cache_data['last_scan_time'] = self._last_scan_time
+                cache_data['version'] = _CACHE_VERSION
+                payload = dumps_json(cache_data)
+                count = len(self._metadata_cache)
+                self._dirty = False
+            
+            if self._save_cache_file(payload):
+                logger.debug(f"Saved cache with {count} conversations")
+            else:
+                # Keep the changes pending so a later flush retries them
+                self._dirty = True
+    
+    def _save_cache_file(self, payload: bytes) -> bool:
+        """
+        Write an encoded cache snapshot to disk.
+        
+        Args:
+            payload: Encoded index file contents
+            
+        Returns:
+            True if the index file was replaced
+        """
+        try:
+            # Compact output: the index is only ever read back by this class.
+            # Write a temporary file and swap it in, so a crash mid-write
+            # leaves the previous index intact instead of forcing a rebuild
+            tmp_file = self._cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self._cache_file)
+            return True
             
         except Exception as e:
             logger.warning(f"Failed to save cache file: {e}")
+            return False
     
-    def get_all_metadata(self) -> List[Dict[str, Any]]:
+    def get_all_metadata(self) -> List[Mapping[str, Any]]:
         """
         Get metadata for all conversations.
         
         Returns:
-            List of conversation metadata dictionaries
+            List of read-only conversation metadata mappings; use
+            get_mutable_copy for a dictionary that may be changed
         """
         self._refresh_if_needed()
         
-        with self._lock:
-            # Sort by updated_at, most recent first
-            conversations = list(self._metadata_cache.values())
-            conversations.sort(key=lambda x: x['updated_at'], reverse=True)
-            return conversations
+        # Most recently updated first; the ordering is maintained on every change
+        with self._lock.read_lock():
+            views = self._metadata_views
+            return [views[conv_id] for _, conv_id in reversed(self._updated_order)]
     
-    def search_metadata(self, query: str, search_content: bool = False) -> List[Dict[str, Any]]:
+    def get_mutable_copy(self, conv_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a private, modifiable copy of one conversation's metadata.
+        
+        Args:
+            conv_id: Conversation ID
+            
+        Returns:
+            Copy of the metadata dictionary, or None if not cached
+        """
+        with self._lock.read_lock():
+            metadata = self._metadata_cache.get(conv_id)
+            if metadata is None:
+                return None
+            copied = metadata.copy()
+            copied['tags'] = list(copied['tags'])
+            return copied
+    
+    def search_metadata(self, query: str, search_content: bool = False,
+                        limit: Optional[int] = None) -> List[Mapping[str, Any]]:
         """
         Search conversations by title, tags, or description.
         
         Args:
             query: Search query string
             search_content: If True, search message content (requires file I/O)
+            limit: Maximum number of results to return, or None for all
             
         Returns:
-            List of matching conversation metadata
+            List of matching read-only conversation metadata mappings
         """
         self._refresh_if_needed()
         query_lower = query.lower()
-        results = []
+        query_tokens = _TOKEN_RE.findall(query_lower)
+        matches = []
         
-        with self._lock:
-            for conv_metadata in self._metadata_cache.values():
+        with self._lock.read_lock():
+            if search_content or not query_tokens:
+                # Content search has to visit every conversation anyway
+                candidates = self._metadata_cache
+            else:
+                candidates = self._candidate_ids(query_tokens)
+            
+            for conv_id in candidates:
+                conv_metadata = self._metadata_cache[conv_id]
+                title_lc, desc_lc, tags_lc = self._search_fields[conv_id]
+                title_match = query_lower in title_lc
+                
                 # Search in title, tags, and description
-                if (query_lower in conv_metadata['title'].lower() or
-                    query_lower in conv_metadata.get('description', '').lower() or
-                    any(query_lower in tag.lower() for tag in conv_metadata['tags'])):
-                    results.append(conv_metadata.copy())
+                if (title_match or
+                    query_lower in desc_lc or
+                    any(query_lower in tag for tag in tags_lc)):
+                    matches.append((title_match, self._metadata_views[conv_id]))
                     continue
                 
                 # Search in content if requested (requires loading file)
                 if search_content:
                     if self._search_in_conversation_content(conv_metadata['id'], query_lower):
-                        results.append(conv_metadata.copy())
+                        matches.append((False, self._metadata_views[conv_id]))
+        
+        # Rank by relevance: title matches first, each group most recently
+        # updated first. updated_at holds naive ISO 8601 strings, which order
+        # the same as the times they encode, so they are compared directly
+        title_group = [view for title_match, view in matches if title_match]
+        other_group = [view for title_match, view in matches if not title_match]
+        
+        def updated_at(view: Mapping[str, Any]) -> str:
+            return view['updated_at']
         
-        # Sort results by relevance (title match first, then updated_at)
-        def sort_key(conv):
-            title_match = query_lower in conv['title'].lower()
-            return (not title_match, -time.mktime(time.strptime(conv['updated_at'], '%Y-%m-%dT%H:%M:%S.%f')))
+        if limit is None:
+            title_group.sort(key=updated_at, reverse=True)
+            other_group.sort(key=updated_at, reverse=True)
+            return title_group + other_group
         
-        results.sort(key=sort_key)
+        # Partial selection only orders the entries that are returned
+        results = heapq.nlargest(limit, title_group, key=updated_at)
+        if len(results) < limit:
+            results += heapq.nlargest(limit - len(results), other_group, key=updated_at)
         return results
     
     def _search_in_conversation_content(self, conv_id: str, query_lower: str) -> bool:
@@ -245,15 +820,10 @@ class ConversationIndexCache:
             True if query found in message content
         """
         try:
-            file_path = self.storage_dir / f"{conv_id}.json"
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            for message in data.get('messages', []):
-                if query_lower in message.get('content', '').lower():
-                    return True
-            
-            return False
+            file_path = os.path.join(self.storage_dir, f"{conv_id}.json")
+            st = os.stat(file_path)
+            contents = _lowercased_contents(file_path, st.st_mtime_ns, st.st_size)
+            return any(query_lower in content for content in contents)
             
         except Exception as e:
             logger.warning(f"Failed to search content in {conv_id}: {e}")
@@ -267,16 +837,23 @@ class ConversationIndexCache:
             conv_id: Conversation ID
             metadata: Updated metadata dictionary
         """
-        with self._lock:
-            self._metadata_cache[conv_id] = metadata
-            
-            # Update file modification time
-            file_path = self.storage_dir / f"{conv_id}.json"
-            if file_path.exists():
-                self._file_mtimes[conv_id] = file_path.stat().st_mtime
+        # Fingerprint the file before taking the lock to keep the exclusive
+        # section down to in-memory updates
+        file_path = self.storage_dir / f"{conv_id}.json"
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            fp = None
+        else:
+            fp = (st.st_mtime_ns, st.st_size)
+        
+        with self._lock.write_lock():
+            self._store_metadata(conv_id, metadata)
+            if fp is not None:
+                self._file_fp[conv_id] = fp
             
-            # Save updated cache
-            self._save_cache_file()
+            # Write the index file later, together with other pending changes
+            self._mark_dirty()
         
         logger.debug(f"Updated metadata for conversation {conv_id}")
     
@@ -287,15 +864,19 @@ class ConversationIndexCache:
         Args:
             conv_id: Conversation ID to remove
         """
-        with self._lock:
-            self._metadata_cache.pop(conv_id, None)
-            self._file_mtimes.pop(conv_id, None)
-            self._save_cache_file()
+        with self._lock.write_lock():
+            self._discard_metadata(conv_id)
+            self._file_fp.pop(conv_id, None)
+            self._mark_dirty()
         
         logger.debug(f"Removed conversation {conv_id} from cache")
     
     def _refresh_if_needed(self) -> None:
         """Check if cache needs refresh and update if necessary."""
+        if self._observer is not None:
+            # Change notifications keep the cache current
+            return
+        
         # Only check periodically to avoid excessive file system calls
         current_time = time.time()
         if current_time - self._last_scan_time > 30:  # Check every 30 seconds
@@ -315,10 +896,11 @@ class ConversationIndexCache:
         Returns:
             Dictionary with cache statistics
         """
-        with self._lock:
+        with self._lock.read_lock():
             return {
                 'conversation_count': len(self._metadata_cache),
                 'last_scan_time': self._last_scan_time,
                 'cache_file_exists': self._cache_file.exists(),
+                'watching': self._observer is not None,
                 'storage_dir': str(self.storage_dir)
             }
\ No newline at end of file
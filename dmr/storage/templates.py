@@ -6,13 +6,20 @@ for conversation workflows and common use cases.
 """
 
 import json
+import os
+import re
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict, field
 
 from .conversation import Conversation, ConversationMetadata, Message
+from ..utils.serialization import dumps_json, loads_json
+
+
+# {variable} placeholders in template message content
+_VAR_RE = re.compile(r'\{(\w+)\}')
 
 
 @dataclass
@@ -24,11 +31,13 @@ class TemplateMessage:
     
     def render(self, variables: Dict[str, str]) -> str:
         """Render template content with variables."""
-        content = self.content
-        for key, value in variables.items():
-            placeholder = f"{{{key}}}"
-            content = content.replace(placeholder, str(value))
-        return content
+        # One pass over the content; substituted values are never rescanned,
+        # and placeholders without a value are left as they are
+        def substitute(match: re.Match) -> str:
+            key = match.group(1)
+            return str(variables[key]) if key in variables else match.group(0)
+        
+        return _VAR_RE.sub(substitute, self.content)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert template message to dictionary."""
@@ -80,23 +89,27 @@ class Template:
         self.messages: List[TemplateMessage] = []
         self.default_model = "ai/gemma3"
         self.model_config: Dict[str, Any] = {}
+        # Placeholders found in the messages; reset whenever a message is added
+        self._required_vars_cache: Optional[List[str]] = None
     
-    def add_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> TemplateMessage:
-        """Add a message to the template."""
+    def add_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None,
+                    now: Optional[datetime] = None) -> TemplateMessage:
+        """Add a message to the template; pass now to reuse one clock reading across calls."""
         message = TemplateMessage(role=role, content=content, metadata=metadata or {})
         self.messages.append(message)
-        self.metadata.updated_at = datetime.now()
+        self.metadata.updated_at = now or datetime.now()
+        self._required_vars_cache = None
         return message
     
     def get_required_variables(self) -> List[str]:
         """Get all required variables from template messages."""
-        variables = set()
-        for message in self.messages:
-            # Simple extraction of {variable} patterns
-            import re
-            found_vars = re.findall(r'\{(\w+)\}', message.content)
-            variables.update(found_vars)
-        return list(variables)
+        if self._required_vars_cache is None:
+            variables = set()
+            for message in self.messages:
+                # Simple extraction of {variable} patterns
+                variables.update(_VAR_RE.findall(message.content))
+            self._required_vars_cache = list(variables)
+        return list(self._required_vars_cache)
     
     def validate_variables(self, variables: Dict[str, str]) -> List[str]:
         """Validate that all required variables are provided."""
@@ -112,10 +125,13 @@ class Template:
             raise ValueError(f"Missing required variables: {', '.join(missing_vars)}")
         
         # Create conversation metadata
-        conversation_title = title or f"{self.metadata.name} - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        now = datetime.now()
+        conversation_title = title or f"{self.metadata.name} - {now.strftime('%Y-%m-%d %H:%M')}"
         conv_metadata = ConversationMetadata(
             title=conversation_title,
             model=self.default_model,
+            created_at=now,
+            updated_at=now,
             description=f"Created from template: {self.metadata.name}",
             tags=self.metadata.tags.copy(),
             model_config=self.model_config.copy()
@@ -161,8 +177,9 @@ class Template:
     def save(self, file_path: Path) -> None:
         """Save template to file."""
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        # Encode to UTF-8 bytes once and write them in a single call
+        with open(file_path, 'wb') as f:
+            f.write(dumps_json(self.to_dict(), indent=2))
     
     @classmethod
     def load(cls, file_path: Path) -> 'Template':
@@ -172,6 +189,20 @@ class Template:
         return cls.from_dict(data)
 
 
+def _template_summary(template_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the list_templates() entry for a template from its metadata dictionary."""
+    return {
+        'id': template_id,
+        'name': metadata['name'],
+        'description': metadata['description'],
+        'category': metadata['category'],
+        'tags': metadata.get('tags', []),
+        'author': metadata.get('author', 'Unknown'),
+        'created_at': metadata['created_at'],
+        'variables': metadata.get('variables', [])
+    }
+
+
 class TemplateManager:
     """Manages templates and provides template operations."""
     
@@ -179,7 +210,86 @@ class TemplateManager:
         self.storage_dir = storage_dir or Path.cwd() / "dmr" / "storage" / "data" / "templates"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self._templates: Dict[str, Template] = {}
+        # Template ID -> file and listing entry, kept in step with saves and deletes
+        self._id_to_path: Dict[str, Path] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        # Lowercased category -> template IDs
+        self._by_category: Dict[str, Set[str]] = {}
+        # File path string -> ((st_mtime_ns, st_size), template ID or None if
+        # unreadable) as last parsed
+        self._listing_cache: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
         self._create_default_templates()
+        self._scan_index()
+    
+    def _scan_index(self) -> None:
+        """
+        Bring the ID and listing maps in line with the template files on disk.
+        
+        Only files whose (mtime, size) fingerprint changed since they were
+        last parsed are read again; the rest cost a single stat.
+        """
+        seen = set()
+        with os.scandir(self.storage_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                fingerprint = (st.st_mtime_ns, st.st_size)
+                path_key = entry.path
+                seen.add(path_key)
+                
+                cached = self._listing_cache.get(path_key)
+                if cached is not None:
+                    if cached[0] == fingerprint:
+                        continue
+                    self._forget_file(path_key, cached[1])
+                
+                file_path = Path(path_key)
+                try:
+                    data = loads_json(file_path.read_bytes())
+                    summary = _template_summary(data['id'], data['metadata'])
+                except (json.JSONDecodeError, KeyError, OSError):
+                    self._listing_cache[path_key] = (fingerprint, None)
+                    continue
+                self._index_template(file_path, summary)
+                self._listing_cache[path_key] = (fingerprint, summary['id'])
+        
+        # Files deleted behind our back
+        for path_key in [key for key in self._listing_cache if key not in seen]:
+            self._forget_file(path_key, self._listing_cache.pop(path_key)[1])
+    
+    def _forget_file(self, path_key: str, template_id: Optional[str]) -> None:
+        """Drop the map entries a file contributed, unless another file now owns the ID."""
+        if template_id is None:
+            return
+        owner = self._id_to_path.get(template_id)
+        if owner is not None and str(owner) == path_key:
+            self._unindex_template(template_id)
+            self._templates.pop(template_id, None)
+    
+    def _index_template(self, file_path: Path, summary: Dict[str, Any]) -> None:
+        """Record a template's file, listing entry and category membership."""
+        template_id = summary['id']
+        self._unindex_template(template_id)
+        self._id_to_path[template_id] = file_path
+        self._summaries[template_id] = summary
+        self._by_category.setdefault(summary['category'].lower(), set()).add(template_id)
+    
+    def _unindex_template(self, template_id: str) -> Optional[Path]:
+        """Remove a template from the index maps, returning the file it was mapped to."""
+        file_path = self._id_to_path.pop(template_id, None)
+        summary = self._summaries.pop(template_id, None)
+        if summary is not None:
+            category = summary['category'].lower()
+            members = self._by_category.get(category)
+            if members is not None:
+                members.discard(template_id)
+                if not members:
+                    del self._by_category[category]
+        return file_path
     
     def _create_default_templates(self) -> None:
         """Create default templates if they don't exist."""
@@ -248,18 +358,21 @@ class TemplateManager:
     
     def _create_default_template(self, template_data: Dict[str, Any], file_path: Path) -> None:
         """Create a default template file."""
+        now = datetime.now()
         metadata = TemplateMetadata(
             name=template_data['name'],
             description=template_data['description'],
             category=template_data['category'],
             tags=template_data['tags'],
+            created_at=now,
+            updated_at=now,
             variables=template_data.get('variables', [])
         )
         
         template = Template(metadata=metadata)
         
         for role, content in template_data['messages']:
-            template.add_message(role, content)
+            template.add_message(role, content, now=now)
         
         template.save(file_path)
     
@@ -275,17 +388,21 @@ class TemplateManager:
         if template_id in self._templates:
             return self._templates[template_id]
         
-        # Try to load from disk
-        for file_path in self.storage_dir.glob("*.json"):
-            try:
-                template = Template.load(file_path)
-                if template.id == template_id:
-                    self._templates[template.id] = template
-                    return template
-            except (json.JSONDecodeError, KeyError):
-                continue
+        # Try to load from disk, rescanning once for files written elsewhere
+        file_path = self._id_to_path.get(template_id)
+        if file_path is None:
+            self._scan_index()
+            file_path = self._id_to_path.get(template_id)
+            if file_path is None:
+                return None
         
-        return None
+        try:
+            template = Template.load(file_path)
+        except (json.JSONDecodeError, KeyError, OSError):
+            return None
+        
+        self._templates[template.id] = template
+        return template
     
     def get_template_by_name(self, name: str) -> Optional[Template]:
         """Get a template by name."""
@@ -299,29 +416,19 @@ class TemplateManager:
         file_name = f"{template.metadata.name.lower().replace(' ', '_')}_{template.id[:8]}.json"
         file_path = self.storage_dir / file_name
         template.save(file_path)
+        
+        self._index_template(file_path, _template_summary(template.id, template.metadata.to_dict()))
+        st = file_path.stat()
+        self._listing_cache[str(file_path)] = ((st.st_mtime_ns, st.st_size), template.id)
         return file_path
     
     def list_templates(self) -> List[Dict[str, Any]]:
         """List all available templates with metadata."""
-        templates = []
+        # Pick up templates added, edited or removed outside this manager
+        self._scan_index()
         
-        # Load templates from disk
-        for file_path in self.storage_dir.glob("*.json"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                templates.append({
-                    'id': data['id'],
-                    'name': data['metadata']['name'],
-                    'description': data['metadata']['description'],
-                    'category': data['metadata']['category'],
-                    'tags': data['metadata'].get('tags', []),
-                    'author': data['metadata'].get('author', 'Unknown'),
-                    'created_at': data['metadata']['created_at'],
-                    'variables': data['metadata'].get('variables', [])
-                })
-            except (json.JSONDecodeError, KeyError):
-                continue
+        # Copies, so callers cannot alter the cached entries
+        templates = [summary.copy() for summary in self._summaries.values()]
         
         # Sort by name
         templates.sort(key=lambda x: x['name'])
@@ -329,8 +436,15 @@ class TemplateManager:
     
     def list_templates_by_category(self, category: str) -> List[Dict[str, Any]]:
         """List templates filtered by category."""
-        all_templates = self.list_templates()
-        return [t for t in all_templates if t['category'].lower() == category.lower()]
+        # Pick up templates added, edited or removed outside this manager
+        self._scan_index()
+        
+        templates = [
+            self._summaries[template_id].copy()
+            for template_id in self._by_category.get(category.lower(), ())
+        ]
+        templates.sort(key=lambda x: x['name'])
+        return templates
     
     def search_templates(self, query: str) -> List[Dict[str, Any]]:
         """Search templates by name, description, or tags."""
@@ -347,16 +461,13 @@ class TemplateManager:
     
     def delete_template(self, template_id: str) -> bool:
         """Delete a template."""
-        # Find and remove file
-        for file_path in self.storage_dir.glob("*.json"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if data['id'] == template_id:
-                    file_path.unlink()
-                    break
-            except (json.JSONDecodeError, KeyError):
-                continue
+        # Find and remove file, rescanning once for files written elsewhere
+        if template_id not in self._id_to_path:
+            self._scan_index()
+        file_path = self._unindex_template(template_id)
+        if file_path is not None:
+            file_path.unlink(missing_ok=True)
+            self._listing_cache.pop(str(file_path), None)
         
         # Remove from memory cache
         if template_id in self._templates:
@@ -0,0 +1,93 @@
+"""
+File I/O helpers for D-Model-Runner.
+
+Provides a background writer so that callers producing large outputs can keep
+encoding while previously produced chunks are written to disk.
+"""
+
+import queue
+import threading
+from typing import BinaryIO, Optional
+
+
+class AsyncChunkWriter:
+    """
+    Write byte chunks to a file object from a background thread.
+
+    The producer hands over complete chunks with ``put``; a worker thread
+    drains the bounded queue and calls ``write`` on the file object. The
+    worker is started lazily on the first chunk, so small outputs that are
+    written in a single ``close`` never spawn a thread. Errors raised by the
+    worker are re-raised in the producer on the next ``put`` or on ``close``.
+    """
+
+    def __init__(self, file_obj: BinaryIO, max_pending: int = 16):
+        """
+        Initialize the writer.
+
+        Args:
+            file_obj: Binary file object to write to
+            max_pending: Maximum number of chunks queued before ``put`` blocks
+        """
+        self._file = file_obj
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def put(self, chunk: bytes) -> None:
+        """
+        Queue a chunk for writing.
+
+        Args:
+            chunk: Bytes to write; the caller must not mutate it afterwards
+        """
+        self._raise_pending_error()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._drain, name="dmr-chunk-writer", daemon=True)
+            self._thread.start()
+        self._queue.put(chunk)
+
+    def close(self, final_chunk: Optional[bytes] = None) -> None:
+        """
+        Write any final chunk and wait for all queued chunks to reach the file.
+
+        Args:
+            final_chunk: Optional trailing bytes to write after queued chunks
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_pending_error()
+        if final_chunk:
+            self._file.write(final_chunk)
+
+    def __enter__(self) -> "AsyncChunkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._thread is not None:
+            # Stop the worker without masking the original exception
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _drain(self) -> None:
+        """Worker loop writing queued chunks until the stop sentinel arrives."""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            if self._error is not None:
+                continue
+            try:
+                self._file.write(chunk)
+            except BaseException as e:
+                self._error = e
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -5,7 +5,17 @@ Common utility functions used throughout the package.
 """
 
 import re
-from typing import Optional, Dict, Any
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Callable, Optional, Dict, Any
+
+
+# strftime format that datetime.isoformat(' ', 'seconds') reproduces exactly
+# for naive datetimes with four-digit years, several times faster
+_SECONDS_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Pattern: namespace/model (e.g., ai/gemma3)
+_MODEL_NAME_RE = re.compile(r'^[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+$')
 
 
 def validate_model_name(model: str) -> bool:
@@ -18,12 +28,10 @@ def validate_model_name(model: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if not model or not isinstance(model, str):
+    if not isinstance(model, str) or not model:
         return False
     
-    # Pattern: namespace/model (e.g., ai/gemma3)
-    pattern = r'^[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+$'
-    return bool(re.match(pattern, model))
+    return _MODEL_NAME_RE.match(model) is not None
 
 
 def format_error_message(error: Exception, context: Optional[str] = None) -> str:
@@ -43,21 +51,49 @@ def format_error_message(error: Exception, context: Optional[str] = None) -> str
     return error_msg
 
 
-def merge_configs(base_config: Dict[str, Any], override_config: Dict[str, Any]) -> Dict[str, Any]:
+def timestamp_formatter(timestamp_format: str) -> Callable[[datetime], str]:
+    """
+    Get a function formatting datetimes with a strftime format.
+    
+    Exporters format one timestamp per message, so the common seconds
+    format gets a fast path; every other format uses strftime.
+    
+    Args:
+        timestamp_format: strftime format string
+        
+    Returns:
+        Function mapping a datetime to its formatted string
+    """
+    if timestamp_format != _SECONDS_TIMESTAMP_FORMAT:
+        return lambda value: value.strftime(timestamp_format)
+    
+    def format_seconds(value: datetime) -> str:
+        if value.tzinfo is None and value.year >= 1000:
+            return value.isoformat(' ', 'seconds')
+        return value.strftime(timestamp_format)
+    
+    return format_seconds
+
+
+def merge_configs(base_config: Mapping, override_config: Mapping) -> Dict[str, Any]:
     """
     Recursively merge two configuration dictionaries.
     
     Args:
-        base_config: Base configuration dictionary
-        override_config: Override configuration dictionary
+        base_config: Base configuration mapping
+        override_config: Override configuration mapping
         
     Returns:
-        Merged configuration dictionary
+        Merged configuration dictionary; always a new plain dict
     """
-    result = base_config.copy()
+    # Nothing to override: a shallow copy, as the merge below would produce
+    if not override_config:
+        return dict(base_config)
+    
+    result = dict(base_config)
     
     for key, value in override_config.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+        if key in result and isinstance(result[key], Mapping) and isinstance(value, Mapping):
             result[key] = merge_configs(result[key], value)
         else:
             result[key] = value
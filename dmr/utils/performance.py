@@ -7,16 +7,147 @@ across the application to identify optimization opportunities.
 
 import time
 import functools
+import itertools
 import threading
+import weakref
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, Iterator, List, Any, Optional, Callable, Tuple
 from collections import defaultdict, deque
-import json
 from datetime import datetime
 
+from .serialization import dumps_json
+
+
+# Window for the 'recent_samples' statistic, in seconds
+_RECENT_WINDOW = 300
+
+# Seconds between background drains of the per-thread sample buffers
+_DRAIN_INTERVAL = 0.05
+
+# Summary report categories and the lowercase substrings that select them
+_SUMMARY_CATEGORIES = (
+    ('Configuration', ('config',)),
+    ('Conversation', ('conversation', 'search')),
+    ('Export', ('export',)),
+    ('API', ('chat', 'api')),
+    ('Cache', ('cache', 'hit', 'miss')),
+)
+
+# Buffered sample: (operation, kind, value, monotonic timestamp, metadata)
+_PendingSample = Tuple[str, str, float, float, Optional[Dict[str, Any]]]
+
+
+class _MetricSeries:
+    """
+    Samples of one operation stored as parallel columns.
+    
+    Values and ``time.monotonic()`` timestamps are kept as plain floats so
+    statistics reduce over them directly; sample dictionaries and ISO
+    timestamps are only built on export. The series lock keeps the columns
+    aligned, so operations recorded from different threads do not contend.
+    """
+    
+    __slots__ = ('lock', 'values', 'timestamps', 'kinds', 'metadata')
+    
+    def __init__(self, max_samples: int):
+        self.lock = threading.Lock()
+        self.values: deque = deque(maxlen=max_samples)
+        # Appended in time order, so the newest samples are at the right
+        self.timestamps: deque = deque(maxlen=max_samples)
+        # 'duration' for timed operations, 'value' for recorded metrics
+        self.kinds: deque = deque(maxlen=max_samples)
+        # None when a sample has no metadata, so empty dicts are not kept per sample
+        self.metadata: deque = deque(maxlen=max_samples)
+    
+    def extend(self, samples: List[_PendingSample]) -> None:
+        """Append a batch of buffered samples under a single lock acquisition."""
+        with self.lock:
+            for _, kind, value, timestamp, metadata in samples:
+                self.values.append(value)
+                self.timestamps.append(timestamp)
+                self.kinds.append(kind)
+                self.metadata.append(metadata)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Compute statistics over the samples; the caller holds the lock."""
+        values = self.values
+        if not values:
+            return {'count': 0}
+        
+        # Timestamps ascend (up to drain batching), so walk back from the newest until one is too old
+        cutoff = time.monotonic() - _RECENT_WINDOW
+        recent = 0
+        for timestamp in reversed(self.timestamps):
+            if timestamp < cutoff:
+                break
+            recent += 1
+        
+        return {
+            'count': len(values),
+            'min': min(values),
+            'max': max(values),
+            'mean': sum(values) / len(values),
+            'recent_samples': recent  # Last 5 minutes
+        }
+    
+    def samples(self, wall_offset: float) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the exported per-sample dictionaries; the caller holds the lock.
+        
+        Args:
+            wall_offset: Seconds to add to a monotonic timestamp to get epoch time
+            
+        Yields:
+            One sample dictionary at a time
+        """
+        fromtimestamp = datetime.fromtimestamp
+        for kind, value, timestamp, metadata in zip(self.kinds, self.values, self.timestamps, self.metadata):
+            yield {kind: value, 'timestamp': fromtimestamp(timestamp + wall_offset).isoformat(), 'metadata': metadata or {}}
+
+
+# Collectors with per-thread buffers to drain. Held weakly, so the shared
+# drainer thread never keeps a collector alive; the thread exits once the
+# set is empty and is started again by the next registration.
+_drain_targets: "weakref.WeakSet[PerformanceMetrics]" = weakref.WeakSet()
+_drain_targets_lock = threading.Lock()
+_drainer: Optional[threading.Thread] = None
+
+
+def _register_for_drain(metrics: "PerformanceMetrics") -> None:
+    """Have the shared drainer thread flush a collector periodically."""
+    global _drainer
+    with _drain_targets_lock:
+        _drain_targets.add(metrics)
+        if _drainer is None:
+            _drainer = threading.Thread(target=_drain_loop, name="dmr-metrics-drain", daemon=True)
+            _drainer.start()
+
+
+def _drain_loop() -> None:
+    """Flush every live collector each interval until none remain."""
+    global _drainer
+    while True:
+        time.sleep(_DRAIN_INTERVAL)
+        with _drain_targets_lock:
+            targets = list(_drain_targets)
+            if not targets:
+                _drainer = None
+                return
+        for metrics in targets:
+            metrics.flush()
+        # Drop the strong references before sleeping so collectors can be freed
+        del targets, metrics
+
 
 class PerformanceMetrics:
-    """Thread-safe performance metrics collector."""
+    """
+    Thread-safe performance metrics collector.
+    
+    Recording threads append samples to a buffer of their own without
+    taking any lock. A shared background thread drains the buffers into the
+    per-operation series in batches, and every read flushes first, so
+    statistics and exports always include samples recorded before the call.
+    """
     
     def __init__(self, max_samples: int = 1000):
         """
@@ -26,11 +157,20 @@ class PerformanceMetrics:
             max_samples: Maximum number of samples to keep per metric
         """
         self.max_samples = max_samples
-        self._metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_samples))
+        self._metrics: Dict[str, _MetricSeries] = {}
+        # Only guards adding and removing operations; samples use the series lock
         self._lock = threading.Lock()
-        self._start_times: Dict[str, float] = {}
+        # Anchors the monotonic sample clock to wall-clock time for export
+        self._wall_offset = time.time() - time.monotonic()
+        # Timer handle -> (operation, perf_counter at start)
+        self._start_times: Dict[int, Tuple[str, float]] = {}
+        self._timer_ids = itertools.count()
+        # Per-thread sample buffers and the threads that own them
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, deque]] = []
+        self._drain_lock = threading.Lock()
     
-    def start_timer(self, operation: str) -> str:
+    def start_timer(self, operation: str) -> int:
         """
         Start timing an operation.
         
@@ -40,11 +180,11 @@ class PerformanceMetrics:
         Returns:
             Timer ID for stopping the timer
         """
-        timer_id = f"{operation}_{time.time()}"
-        self._start_times[timer_id] = time.time()
+        timer_id = next(self._timer_ids)
+        self._start_times[timer_id] = (operation, time.perf_counter())
         return timer_id
     
-    def end_timer(self, timer_id: str, metadata: Optional[Dict[str, Any]] = None) -> float:
+    def end_timer(self, timer_id: int, metadata: Optional[Dict[str, Any]] = None) -> float:
         """
         End timing an operation and record the duration.
         
@@ -55,21 +195,15 @@ class PerformanceMetrics:
         Returns:
             Duration in seconds
         """
-        if timer_id not in self._start_times:
+        started = self._start_times.pop(timer_id, None)
+        if started is None:
             return 0.0
         
-        duration = time.time() - self._start_times[timer_id]
-        operation = timer_id.split('_')[0]
+        operation, start = started
+        duration = time.perf_counter() - start
         
-        with self._lock:
-            sample = {
-                'duration': duration,
-                'timestamp': datetime.now().isoformat(),
-                'metadata': metadata or {}
-            }
-            self._metrics[operation].append(sample)
+        self._buffer().append((operation, 'duration', duration, time.monotonic(), metadata or None))
         
-        del self._start_times[timer_id]
         return duration
     
     def record_metric(self, operation: str, value: float, metadata: Optional[Dict[str, Any]] = None):
@@ -81,13 +215,53 @@ class PerformanceMetrics:
             value: Metric value
             metadata: Optional metadata
         """
+        self._buffer().append((operation, 'value', value, time.monotonic(), metadata or None))
+    
+    def _buffer(self) -> deque:
+        """Return the calling thread's sample buffer, registering it on first use."""
+        try:
+            return self._local.buffer
+        except AttributeError:
+            pass
+        
+        buffer: deque = deque()
         with self._lock:
-            sample = {
-                'value': value,
-                'timestamp': datetime.now().isoformat(),
-                'metadata': metadata or {}
-            }
-            self._metrics[operation].append(sample)
+            self._buffers.append((threading.current_thread(), buffer))
+        self._local.buffer = buffer
+        _register_for_drain(self)
+        return buffer
+    
+    def flush(self) -> None:
+        """Move all buffered samples into the per-operation series."""
+        with self._drain_lock:
+            with self._lock:
+                buffers = list(self._buffers)
+            
+            batches: Dict[str, List[_PendingSample]] = {}
+            for _, buffer in buffers:
+                # popleft is safe against the owning thread appending on the right
+                while buffer:
+                    sample = buffer.popleft()
+                    batches.setdefault(sample[0], []).append(sample)
+            
+            for operation, samples in batches.items():
+                self._series(operation).extend(samples)
+            
+            # Drop buffers of finished threads; they cannot receive more samples
+            if any(not thread.is_alive() for thread, _ in buffers):
+                with self._lock:
+                    self._buffers = [
+                        (thread, buffer) for thread, buffer in self._buffers
+                        if thread.is_alive() or buffer
+                    ]
+    
+    def _series(self, operation: str) -> _MetricSeries:
+        """Return the series for an operation, creating it on first use."""
+        series = self._metrics.get(operation)
+        if series is None:
+            with self._lock:
+                series = self._metrics.setdefault(operation, _MetricSeries(self.max_samples))
+        return series
     
     def get_stats(self, operation: str) -> Dict[str, Any]:
         """
@@ -99,69 +273,70 @@ class PerformanceMetrics:
         Returns:
             Dictionary with min, max, mean, count statistics
         """
-        with self._lock:
-            if operation not in self._metrics:
-                return {'count': 0}
-            
-            samples = list(self._metrics[operation])
-            if not samples:
-                return {'count': 0}
-            
-            # Extract values (duration or value field)
-            values = []
-            for sample in samples:
-                if 'duration' in sample:
-                    values.append(sample['duration'])
-                elif 'value' in sample:
-                    values.append(sample['value'])
-            
-            if not values:
-                return {'count': 0}
-            
-            return {
-                'count': len(values),
-                'min': min(values),
-                'max': max(values),
-                'mean': sum(values) / len(values),
-                'recent_samples': len([s for s in samples if self._is_recent(s['timestamp'], 300)])  # Last 5 minutes
-            }
+        self.flush()
+        series = self._metrics.get(operation)
+        if series is None:
+            return {'count': 0}
+        
+        with series.lock:
+            return series.stats()
     
     def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all operations."""
+        self.flush()
         with self._lock:
-            return {op: self.get_stats(op) for op in self._metrics.keys()}
+            operations = list(self._metrics.items())
+        
+        all_stats = {}
+        for operation, series in operations:
+            with series.lock:
+                all_stats[operation] = series.stats()
+        return all_stats
     
     def export_metrics(self, output_path: Path) -> None:
-        """Export all metrics to a JSON file."""
+        """
+        Export all metrics to a JSON file.
+        
+        The document is streamed one operation at a time, so only that
+        operation's encoded samples are held in memory, and its series lock
+        is released before they are written.
+        
+        Args:
+            output_path: File to write the JSON document to
+        """
+        self.flush()
         with self._lock:
-            export_data = {
-                'exported_at': datetime.now().isoformat(),
-                'metrics': {}
-            }
-            
-            for operation, samples in self._metrics.items():
-                export_data['metrics'][operation] = {
-                    'samples': list(samples),
-                    'stats': self.get_stats(operation)
-                }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+            operations = list(self._metrics.items())
+        
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n  "exported_at": ' + dumps_json(datetime.now().isoformat()) + b',\n  "metrics": {')
+            lead = b'\n    '
+            for operation, series in operations:
+                buf = bytearray(lead)
+                buf += dumps_json(operation)
+                buf += b': {\n      "samples": ['
+                with series.lock:
+                    sample_lead = b'\n        '
+                    for sample in series.samples(self._wall_offset):
+                        buf += sample_lead
+                        buf += dumps_json(sample)
+                        sample_lead = b',\n        '
+                    stats = series.stats()
+                buf += b'\n      ],\n      "stats": '
+                buf += dumps_json(stats)
+                buf += b'\n    }'
+                f.write(buf)
+                lead = b',\n    '
+            f.write(b'\n  }\n}\n')
     
     def clear_metrics(self) -> None:
         """Clear all collected metrics."""
+        # Drain pending samples first so they are cleared rather than applied later
+        self.flush()
         with self._lock:
             self._metrics.clear()
             self._start_times.clear()
-    
-    def _is_recent(self, timestamp_str: str, seconds: int) -> bool:
-        """Check if timestamp is within the last N seconds."""
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str)
-            now = datetime.now()
-            return (now - timestamp).total_seconds() <= seconds
-        except Exception:
-            return False
+
 
 
 # Global metrics instance
@@ -214,11 +389,11 @@ def track_cache_performance(cache_name: str):
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # Assume if result is returned quickly, it's a cache hit
             result = func(*args, **kwargs)
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             # Heuristic: if operation takes less than 1ms, it's likely a cache hit
             is_cache_hit = duration < 0.001
@@ -250,21 +425,19 @@ class PerformanceReport:
         
         lines = ["📊 Performance Summary", "=" * 40]
         
-        # Group operations by category
-        categories = {
-            'Configuration': [k for k in stats.keys() if 'config' in k.lower()],
-            'Conversation': [k for k in stats.keys() if 'conversation' in k.lower() or 'search' in k.lower()],
-            'Export': [k for k in stats.keys() if 'export' in k.lower()],
-            'API': [k for k in stats.keys() if 'chat' in k.lower() or 'api' in k.lower()],
-            'Cache': [k for k in stats.keys() if 'cache' in k.lower() or 'hit' in k.lower() or 'miss' in k.lower()],
-            'Other': []
-        }
-        
-        # Add uncategorized operations to 'Other'
-        categorized = set()
-        for cat_ops in categories.values():
-            categorized.update(cat_ops)
-        categories['Other'] = [k for k in stats.keys() if k not in categorized]
+        # Group operations by category in one pass; an operation may match
+        # several categories and lands in 'Other' only if it matches none
+        categories: Dict[str, List[str]] = {category: [] for category, _ in _SUMMARY_CATEGORIES}
+        categories['Other'] = []
+        for operation in stats:
+            lowered = operation.lower()
+            matched = False
+            for category, keywords in _SUMMARY_CATEGORIES:
+                if any(keyword in lowered for keyword in keywords):
+                    categories[category].append(operation)
+                    matched = True
+            if not matched:
+                categories['Other'].append(operation)
         
         for category, operations in categories.items():
             if not operations:
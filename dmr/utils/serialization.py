@@ -0,0 +1,77 @@
+"""
+JSON serialization helpers for D-Model-Runner.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise, so callers get UTF-8 bytes either way.
+"""
+
+import json
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the stdlib encoder does not understand."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if is_dataclass(value) and not isinstance(value, type):
+        # Shallow field mapping; nested datetimes come back through this hook
+        return {f.name: getattr(value, f.name) for f in fields(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(data: Any, indent: Optional[int] = None, ensure_ascii: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON bytes.
+
+    orjson is used when it can honour the requested formatting (no indent or
+    an indent of 2, non-ASCII output); otherwise the stdlib encoder is used.
+    Datetimes are emitted as ISO 8601 strings and dataclass instances as
+    objects of their fields by both encoders, so callers can pass model
+    objects directly instead of converting them with ``to_dict`` first.
+
+    Args:
+        data: Data to serialize
+        indent: Indentation width, or None for compact output
+        ensure_ascii: Escape non-ASCII characters
+
+    Returns:
+        Encoded JSON document
+    """
+    if ORJSON_AVAILABLE and not ensure_ascii and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    return json.dumps(
+        data,
+        indent=indent,
+        ensure_ascii=ensure_ascii,
+        default=_json_default
+    ).encode('utf-8')
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    Deserialize a UTF-8 JSON document.
+
+    Decode errors raise ``json.JSONDecodeError`` with either backend.
+
+    Args:
+        data: Encoded JSON document
+
+    Returns:
+        Decoded Python object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
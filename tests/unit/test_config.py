@@ -16,7 +16,7 @@ import os
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
-from dmr.config import ConfigManager
+from dmr.config import ConfigManager, OverlayConfig
 from dmr.config.parser import ConfigParser
 from dmr.config.env import EnvironmentHandler
 
@@ -237,6 +237,69 @@ class TestEnvironmentHandler(unittest.TestCase):
             'max_tokens'
         )
 
+    
+    def test_config_overrides_memoized_by_env_snapshot(self):
+        """Test that overrides are reused until the DMR_ environment changes."""
+        with patch.dict(os.environ, {'DMR_BASE_URL': 'http://one/'}):
+            first = EnvironmentHandler.get_config_overrides()
+            self.assertEqual(first['api']['base_url'], 'http://one/')
+            
+            # Callers get copies, so changing one leaves the memoized result intact
+            first['poison'] = 1
+            first['api']['base_url'] = 'http://changed/'
+            with patch.object(EnvironmentHandler, 'load_env_vars',
+                              wraps=EnvironmentHandler.load_env_vars) as load:
+                again = EnvironmentHandler.get_config_overrides()
+            load.assert_not_called()
+            self.assertNotIn('poison', again)
+            self.assertEqual(again['api']['base_url'], 'http://one/')
+        
+        with patch.dict(os.environ, {'DMR_BASE_URL': 'http://two/'}):
+            second = EnvironmentHandler.get_config_overrides()
+            self.assertEqual(second['api']['base_url'], 'http://two/')
+
+
+class TestOverlayConfig(unittest.TestCase):
+    """Test the layered OverlayConfig view."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.default = {
+            'api': {'base_url': 'http://default/', 'models': {'default': 'ai/gemma3', 'available': ['ai/gemma3']}},
+            'logging': {'level': 'INFO'}
+        }
+        self.profile = {'api': {'models': {'default': 'ai/qwen3'}}, 'logging': 'quiet'}
+        self.env = {'api': {'base_url': 'http://env/'}}
+        self.overlay = OverlayConfig([self.env, self.profile, self.default])
+    
+    def test_get_path_resolves_highest_layer(self):
+        """Test dot-path lookups walk layers in priority order."""
+        self.assertEqual(self.overlay.get_path('api.base_url'), 'http://env/')
+        self.assertEqual(self.overlay.get_path('api.models.default'), 'ai/qwen3')
+        self.assertEqual(self.overlay.get_path('api.models.available'), ['ai/gemma3'])
+        self.assertEqual(self.overlay.get_path('api.missing', 'fallback'), 'fallback')
+    
+    def test_scalar_shadows_lower_dicts(self):
+        """Test that a scalar in a higher layer replaces lower dictionaries."""
+        self.assertEqual(self.overlay['logging'], 'quiet')
+        self.assertIsNone(self.overlay.get_path('logging.level'))
+    
+    def test_matches_merge_configs(self):
+        """Test that materializing the overlay equals chained merge_configs."""
+        from dmr.utils.helpers import merge_configs
+        expected = merge_configs(merge_configs(self.default, self.profile), self.env)
+        self.assertEqual(self.overlay.to_dict(), expected)
+        self.assertEqual(dict(self.overlay['api']['models']), expected['api']['models'])
+    
+    def test_merge_with_empty_override_copies(self):
+        """Test that an empty override still returns a new plain dict."""
+        from dmr.utils.helpers import merge_configs
+        models = self.overlay['api']['models']
+        merged = merge_configs(models, {})
+        self.assertIs(type(merged), dict)
+        merged['default'] = 'changed'
+        self.assertEqual(models['default'], 'ai/qwen3')
+
 
 class TestConfigIntegration(unittest.TestCase):
     """Test integration between configuration components."""
@@ -301,6 +364,22 @@ class TestConfigIntegration(unittest.TestCase):
         
         # Environment variable should override profile setting
         self.assertEqual(manager.get_default_model(), 'ai/env-override')
+    
+    def test_returned_config_is_plain_copy(self):
+        """Test loaded configs serialize and can be modified without side effects."""
+        import json
+        manager = ConfigManager(config_dir=self.config_dir)
+        config = manager.load_config('dev')
+        json.dumps(config)
+        
+        config['api']['models']['default'] = 'ai/changed'
+        api_config = manager.get_api_config()
+        api_config['test_marker'] = 5
+        json.dumps(api_config)
+        
+        self.assertEqual(manager.get_default_model(), 'ai/dev-model')
+        self.assertNotIn('test_marker', manager.get_api_config())
+        self.assertEqual(manager.reload_config()['api']['models']['default'], 'ai/dev-model')
 
 
 if __name__ == '__main__':
@@ -8,19 +8,25 @@ Tests cover:
 - Storage operations and error handling
 """
 
+import asyncio
+import gc
 import unittest
 import tempfile
 import shutil
 import json
+import os
+import threading
+import weakref
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 from dmr.storage.conversation import Conversation, Message, ConversationMetadata, ConversationManager
-from dmr.storage.templates import Template, TemplateManager
+from dmr.storage.templates import Template, TemplateManager, TemplateMessage
 from dmr.storage.exporters import ExportManager
 from dmr.storage.formats.json_exporter import JSONExporter
 from dmr.storage.formats.markdown_exporter import MarkdownExporter
+from dmr.storage.index_cache import ConversationIndexCache
 
 
 class TestConversation(unittest.TestCase):
@@ -241,6 +247,83 @@ class TestConversationManager(unittest.TestCase):
         self.assertEqual(results[0]['metadata']['title'], "JavaScript Guide")
 
 
+class TestTemplateVariables(unittest.TestCase):
+    """Test template placeholder detection."""
+    
+    def test_required_variables_follow_added_messages(self):
+        """Test cached required variables are refreshed when messages are added."""
+        template = Template()
+        template.add_message("user", "Hello {name}")
+        self.assertEqual(template.get_required_variables(), ["name"])
+        
+        template.add_message("user", "Welcome to {project}, {name}")
+        
+        self.assertEqual(sorted(template.get_required_variables()), ["name", "project"])
+        self.assertEqual(template.validate_variables({"name": "Ada"}), ["project"])
+    
+    def test_render_substitutes_once(self):
+        """Test values are not rescanned and unknown placeholders are kept."""
+        message = TemplateMessage(role="user", content="{greeting}, {name}! {unused}")
+        
+        rendered = message.render({"greeting": "Hi {name}", "name": "Ada"})
+        
+        self.assertEqual(rendered, "Hi {name}, Ada! {unused}")
+
+
+class TestTemplateIndex(unittest.TestCase):
+    """Test TemplateManager's cached template listing."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.manager = TemplateManager(storage_dir=self.temp_dir)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_listing_follows_external_changes(self):
+        """Test files added, edited and removed on disk show up in listings."""
+        template = self.manager.create_template("External", "Written elsewhere")
+        file_path = self.temp_dir / "external.json"
+        template.save(file_path)
+        self.assertIn("External", [t['name'] for t in self.manager.list_templates()])
+        
+        template.metadata.description = "Edited elsewhere, at more length"
+        template.save(file_path)
+        listed = self.manager.get_template_by_name("External")
+        self.assertEqual(listed.metadata.description, "Edited elsewhere, at more length")
+        
+        file_path.unlink()
+        self.assertNotIn("External", [t['name'] for t in self.manager.list_templates()])
+    
+    def test_category_listing_tracks_saves(self):
+        """Test category lookups follow a template moving between categories."""
+        template = self.manager.create_template("Sorted", "Category test", category="Research")
+        self.manager.save_template(template)
+        self.assertEqual([t['name'] for t in self.manager.list_templates_by_category("research")], ["Sorted"])
+        
+        template.metadata.category = "archive"
+        self.manager.save_template(template)
+        
+        self.assertEqual(self.manager.list_templates_by_category("research"), [])
+        self.assertEqual(len(self.manager.list_templates_by_category("ARCHIVE")), 1)
+        self.assertEqual(len(self.manager.list_templates_by_category("development")), 2)
+    
+    def test_lookup_finds_templates_saved_by_another_manager(self):
+        """Test templates written after startup can be fetched and deleted."""
+        other = TemplateManager(storage_dir=self.temp_dir)
+        template = other.create_template("Shared", "Saved by another manager")
+        other.save_template(template)
+        
+        self.assertEqual(self.manager.get_template(template.id).metadata.name, "Shared")
+        
+        template = other.create_template("Removed", "Deleted by this manager")
+        file_path = other.save_template(template)
+        self.assertTrue(self.manager.delete_template(template.id))
+        self.assertFalse(file_path.exists())
+
+
 class TestTemplateManager(unittest.TestCase):
     """Test the TemplateManager class."""
     
@@ -519,5 +602,303 @@ class TestMarkdownExporter(unittest.TestCase):
         self.assertIn('custom_option', options)
 
 
+class TestMarkdownTemplates(unittest.TestCase):
+    """Test the predefined Markdown option templates."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.exporter = MarkdownExporter()
+    
+    def test_templates(self):
+        """Test predefined option templates."""
+        templates = self.exporter.get_template_options()
+        self.assertEqual(set(templates), {'default', 'clean', 'detailed', 'presentation'})
+        
+        # Returned templates are copies
+        templates['clean']['include_metadata'] = True
+        self.assertFalse(self.exporter.get_template_options()['clean']['include_metadata'])
+        
+        options = self.exporter.apply_template('clean', {'include_timestamps': True})
+        self.assertFalse(options['include_metadata'])
+        self.assertTrue(options['include_timestamps'])
+        self.assertNotIn('description', options)
+        
+        # Unknown templates leave the options untouched
+        self.assertEqual(self.exporter.apply_template('missing', {'a': 1}), {'a': 1})
+
+
+class TestJSONImportRoundTrip(unittest.TestCase):
+    """Test JSON export/validate/import round trips."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.exporter = JSONExporter()
+        self.conversation = Conversation(
+            metadata=ConversationMetadata(title="Round Trip", model="ai/test", tags=["a"])
+        )
+        self.conversation.add_message("user", "Hello")
+        self.conversation.add_message("assistant", "Hi there")
+        self.output_path = self.temp_dir / "round_trip.json"
+        self.exporter.export(self.conversation, self.output_path)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_validate_then_import(self):
+        """Test importing after validation yields independent conversations."""
+        self.assertTrue(self.exporter.validate_import_file(self.output_path)['valid'])
+        
+        first = self.exporter.import_conversation(self.output_path)
+        first.metadata.tags.append("changed")
+        second = self.exporter.import_conversation(self.output_path)
+        
+        self.assertEqual(first.id, self.conversation.id)
+        self.assertEqual([m.content for m in second.messages], ["Hello", "Hi there"])
+        self.assertEqual(second.metadata.tags, ["a"])
+    
+    def test_import_sees_rewritten_file(self):
+        """Test a file rewritten after validation is parsed again."""
+        self.exporter.validate_import_file(self.output_path)
+        self.conversation.add_message("user", "More")
+        self.exporter.export(self.conversation, self.output_path)
+        
+        imported = self.exporter.import_conversation(self.output_path)
+        self.assertEqual(len(imported.messages), 3)
+    
+    def test_gzip_compressed_export(self):
+        """Test gzip-compressed exports get a .gz suffix and import back."""
+        path = self.exporter.export(self.conversation, self.output_path, {'compress': 'gzip'})
+        
+        self.assertEqual(path.name, "round_trip.json.gz")
+        imported = self.exporter.import_conversation(path)
+        self.assertEqual([m.content for m in imported.messages], ["Hello", "Hi there"])
+    
+    def test_multiple_conversations_round_trip(self):
+        """Test collection exports import back with parsed timestamps."""
+        path = self.temp_dir / "collection.json"
+        self.exporter.export_multiple_conversations([self.conversation, self.conversation], path)
+        
+        imported = self.exporter.import_multiple_conversations(path)
+        self.assertEqual(len(imported), 2)
+        self.assertEqual(imported[1].messages[0].timestamp, self.conversation.messages[0].timestamp)
+        self.assertEqual(imported[1].metadata.title, "Round Trip")
+    
+    def test_export_batch_async(self):
+        """Test concurrent batch export writes one file per conversation."""
+        paths = [self.temp_dir / f"batch_{i}.json" for i in range(3)]
+        
+        exported = asyncio.run(self.exporter.export_batch_async([self.conversation] * 3, paths))
+        
+        self.assertEqual(exported, paths)
+        for path in paths:
+            self.assertEqual(len(self.exporter.import_conversation(path).messages), 2)
+    
+    def test_concurrent_exports_get_distinct_files(self):
+        """Test conversations sharing a default filename are written separately."""
+        twin = Conversation(metadata=self.conversation.metadata)
+        output_dir = self.temp_dir / "batch"
+        
+        paths = ExportManager().export_multiple([self.conversation, twin], "json", output_dir)
+        
+        self.assertEqual(len(set(paths)), 2)
+        self.assertEqual({self.exporter.import_conversation(path).id for path in paths},
+                         {self.conversation.id, twin.id})
+    
+    def test_validate_invalid_json(self):
+        """Test malformed files are reported as invalid JSON."""
+        broken = self.temp_dir / "broken.json"
+        broken.write_text('{"conversation": ', encoding='utf-8')
+        
+        result = self.exporter.validate_import_file(broken)
+        self.assertFalse(result['valid'])
+        self.assertTrue(result['errors'][0].startswith("Invalid JSON"))
+    
+    def test_invalid_compression(self):
+        """Test unknown compression names are rejected."""
+        with self.assertRaises(ValueError):
+            self.exporter.validate_options({'compress': 'lz4'})
+    
+    def test_export_many_processes(self):
+        """Test process-parallel exports keep input order."""
+        conversations = [self.conversation, Conversation()]
+        paths = [self.temp_dir / "many_1.json", self.temp_dir / "many_2.json"]
+        
+        results = self.exporter.export_many(conversations, paths, max_workers=2)
+        
+        self.assertEqual(results, paths)
+        self.assertEqual(self.exporter.import_conversation(paths[1]).id, conversations[1].id)
+    
+    def test_fsync_export(self):
+        """Test exports forced to disk still round trip."""
+        fsync_path = self.exporter.export(
+            self.conversation, self.temp_dir / "synced.json", {'fsync': True, 'compress': 'gzip'}
+        )
+        
+        imported = self.exporter.import_conversation(fsync_path)
+        
+        self.assertEqual(len(imported.messages), 2)
+    
+    def test_validate_reports_malformed_messages(self):
+        """Test malformed messages are reported individually."""
+        bad_path = self.temp_dir / "bad.json"
+        bad_path.write_text(json.dumps({'id': 'x', 'messages': [{'role': 'user'}, 'oops']}))
+        
+        result = self.exporter.validate_import_file(bad_path)
+        
+        self.assertEqual(result['errors'], [
+            "Message 0 missing 'content' field",
+            "Message 1 is not a dictionary"
+        ])
+
+
+class TestConversationIndexCache(unittest.TestCase):
+    """Test conversation index cache invalidation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.manager = ConversationManager(self.temp_dir)
+        self.conversation = self.manager.create_conversation("Cached", "ai/test")
+        self.manager.save_conversation(self.conversation)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_same_mtime_edit_is_stale(self):
+        """Test an edit that preserves the mtime is still detected."""
+        cache = ConversationIndexCache(self.temp_dir)
+        self.assertFalse(cache._is_cache_stale())
+        
+        file_path = self.temp_dir / f"{self.conversation.id}.json"
+        st = file_path.stat()
+        file_path.write_bytes(file_path.read_bytes() + b"\n")
+        os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        
+        self.assertTrue(cache._is_cache_stale())
+    
+    def test_new_and_deleted_files_are_stale(self):
+        """Test added and removed conversation files invalidate the cache."""
+        cache = ConversationIndexCache(self.temp_dir)
+        extra = self.temp_dir / "extra.json"
+        extra.write_text("{}")
+        self.assertTrue(cache._is_cache_stale())
+        
+        extra.unlink()
+        (self.temp_dir / f"{self.conversation.id}.json").unlink()
+        self.assertTrue(cache._is_cache_stale())
+    
+    def test_updates_are_flushed_together(self):
+        """Test a burst of updates writes the index file once."""
+        cache = self.manager._index_cache
+        with patch.object(cache, '_save_cache_file', wraps=cache._save_cache_file) as save:
+            for title in ("One", "Two", "Three"):
+                self.manager.save_conversation(self.manager.create_conversation(title, "ai/test"))
+            cache._flush_if_dirty()
+        
+        self.assertEqual(save.call_count, 1)
+        reloaded = ConversationIndexCache(self.temp_dir)
+        self.assertEqual(len(reloaded.get_all_metadata()), 4)
+        self.assertEqual(reloaded._metadata_cache, cache._metadata_cache)
+        self.assertEqual(reloaded._file_fp, cache._file_fp)
+    
+    def test_close_flushes_and_releases_cache(self):
+        """Test close writes pending changes and leaves the cache collectable."""
+        cache = self.manager._index_cache
+        self.manager.save_conversation(self.manager.create_conversation("Pending", "ai/test"))
+        
+        cache.close()
+        
+        self.assertFalse(cache._dirty)
+        self.assertEqual(len(ConversationIndexCache(self.temp_dir).get_all_metadata()), 2)
+        
+        cache = ConversationIndexCache(self.temp_dir)
+        cache.close()
+        ref = weakref.ref(cache)
+        del cache
+        gc.collect()
+        self.assertIsNone(ref())
+    
+    def test_loads_version_1_index(self):
+        """Test an index file in the per-conversation object layout still loads."""
+        cache = self.manager._index_cache
+        cache._flush_if_dirty()
+        legacy = {
+            'metadata': cache._metadata_cache,
+            'fingerprints': cache._file_fp,
+            'last_scan_time': 0,
+            'version': '1.0'
+        }
+        (self.temp_dir / '.conversation_index.json').write_text(json.dumps(legacy))
+        
+        with patch.object(ConversationIndexCache, '_build_cache_from_files') as rebuild:
+            reloaded = ConversationIndexCache(self.temp_dir)
+        
+        rebuild.assert_not_called()
+        self.assertEqual(reloaded._metadata_cache, cache._metadata_cache)
+    
+    def test_search_matches_partial_words_after_update(self):
+        """Test token-indexed search keeps substring semantics and tracks updates."""
+        cache = self.manager._index_cache
+        self.conversation.metadata.title = "Python data science"
+        self.manager.save_conversation(self.conversation)
+        
+        self.assertEqual(len(cache.search_metadata("thon da")), 1)
+        self.assertEqual(cache.search_metadata("cached"), [])
+        
+        cache.remove_conversation(self.conversation.id)
+        self.assertEqual(cache.search_metadata("python"), [])
+    
+    def test_search_orders_title_matches_then_recent(self):
+        """Test search ranking, including timestamps without microseconds."""
+        cache = self.manager._index_cache
+        for conv_id, title, updated_at in (
+            ('old', 'Notes on rust', '2024-01-01T10:00:00'),
+            ('new', 'Notes on rust', '2024-03-01T10:00:00.250000'),
+            ('tagged', 'Misc', '2024-05-01T10:00:00')
+        ):
+            cache.update_conversation_metadata(conv_id, {
+                'id': conv_id, 'title': title, 'model': 'ai/test',
+                'created_at': updated_at, 'updated_at': updated_at,
+                'tags': ['rust'], 'description': '', 'message_count': 0
+            })
+        
+        results = cache.search_metadata("rust")
+        
+        self.assertEqual([r['id'] for r in results], ['new', 'old', 'tagged'])
+        self.assertEqual([r['id'] for r in cache.search_metadata("rust", limit=2)], ['new', 'old'])
+        with self.assertRaises(TypeError):
+            results[0]['title'] = "Changed"
+    
+    def test_content_search_sees_edits(self):
+        """Test cached message text is refreshed when the file changes."""
+        cache = self.manager._index_cache
+        self.conversation.add_message("user", "Tell me about Kestrels")
+        self.manager.save_conversation(self.conversation)
+        self.assertEqual(len(cache.search_metadata("kestrel", search_content=True)), 1)
+        
+        self.conversation.add_message("assistant", "Ospreys are different birds")
+        self.manager.save_conversation(self.conversation)
+        
+        self.assertEqual(len(cache.search_metadata("osprey", search_content=True)), 1)
+    
+    def test_searches_do_not_block_each_other(self):
+        """Test a search can run while another reader holds the lock."""
+        cache = self.manager._index_cache
+        done = threading.Event()
+        
+        def search():
+            cache.search_metadata("cached")
+            done.set()
+        
+        with cache._lock.read_lock():
+            worker = threading.Thread(target=search)
+            worker.start()
+            self.assertTrue(done.wait(timeout=5))
+        worker.join()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file